@@ -0,0 +1,102 @@
+"""Asynchronous wrapper for the TcBuild tool"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from . import tcbuild
+from .exceptions import TcBuildTimeoutError
+from .repositoryindex import RepositoryIndex
+
+
+async def kill_process_tree(process: asyncio.subprocess.Process) -> None:
+    """Kill a process and all of its child processes, and wait for it to exit"""
+    if process.returncode is not None:
+        return
+    await asyncio.to_thread(tcbuild.kill_process_tree, process.pid)
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+class AsyncTcBuild:
+    """Runs TcBuild from an asyncio event loop.
+
+    At most `max_concurrency` TcBuild processes run at the same time, and every
+    invocation is killed (including its child processes) when it takes longer
+    than `timeout` seconds (None waits forever) or when it is cancelled."""
+
+    def __init__(self, max_concurrency: int = 1, timeout: float | None = None) -> None:
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(
+        self, args: list[str], timeout: float | None = None
+    ) -> tuple[int, str]:
+        """Run TcBuild with the given arguments, and return the exit code and console
+        output. Raise TcBuildTimeoutError if it does not finish within `timeout`
+        seconds (defaults to the timeout of the runner)."""
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore:
+            process = await asyncio.create_subprocess_exec(
+                tcbuild.EXECUTABLE,
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **tcbuild.process_group_kwargs(),
+            )
+            try:
+                (stdout, stderr) = await asyncio.wait_for(
+                    process.communicate(), timeout
+                )
+            except asyncio.TimeoutError as exc:
+                await kill_process_tree(process)
+                raise TcBuildTimeoutError(
+                    f"TcBuild did not finish within {timeout} seconds"
+                ) from exc
+            except asyncio.CancelledError:
+                await kill_process_tree(process)
+                raise
+            returncode = await process.wait()
+        output = tcbuild.merge_output(
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+        return (returncode, output)
+
+    async def build(self, path: Path, timeout: float | None = None) -> tuple[bool, str]:
+        """Build the solution. If it fails, return False and the reason why."""
+        await asyncio.to_thread(tcbuild.is_available, True)
+        try:
+            (returncode, output) = await self.run(tcbuild.build_args(path), timeout)
+        except TcBuildTimeoutError as exc:
+            return (False, str(exc))
+        if returncode == 0:
+            return (True, "")
+        return (False, tcbuild.failure_reason(returncode, output))
+
+    async def install(  # pylint:disable=too-many-arguments
+        self,
+        path: Path,
+        xaeproject: str,
+        plcproject: str,
+        libraryfile: str | None = None,
+        repository_index: RepositoryIndex | None = None,
+        timeout: float | None = None,
+    ) -> tuple[bool, str]:
+        """Install a library. If it fails, return False and the reason why.
+        After a successful installation, the `repository_index` (if any) is refreshed."""
+        await asyncio.to_thread(tcbuild.is_available, True)
+        args = tcbuild.install_args(path, xaeproject, plcproject, libraryfile)
+        try:
+            (returncode, output) = await self.run(args, timeout)
+        except TcBuildTimeoutError as exc:
+            return (False, str(exc))
+        if returncode == 0:
+            if repository_index is not None:
+                await asyncio.to_thread(repository_index.refresh)
+            return (True, "")
+        return (False, tcbuild.failure_reason(returncode, output))
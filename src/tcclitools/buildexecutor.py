@@ -0,0 +1,336 @@
+"""Concurrent execution of the builds in a dependency tree"""
+from __future__ import annotations
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterable
+
+from . import tcbuild
+from .buildstate import BuildState, get_fingerprints
+from .dependencytree import DependencyTree, get_dependants
+from .exceptions import TcCliToolsException
+from .libraryindex import LibraryIndex
+from .repositoryindex import RepositoryIndex
+from .tclibraryreference import TcLibraryReference
+from .tcplcproject import TcPlcProject
+from .tcrepolibrary import get_library_repository
+from .tcsolution import TcSolution
+
+
+class BuildStatus(Enum):
+    """Status of a build in the dependency tree"""
+
+    SUCCEEDED = "succeeded"
+    UP_TO_DATE = "up-to-date"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class BuildResult:
+    """Result of a build in the dependency tree"""
+
+    status: BuildStatus
+    output: str = ""
+
+    @property
+    def success(self) -> bool:
+        """True if the build succeeded, or was not needed"""
+        return self.status in (BuildStatus.SUCCEEDED, BuildStatus.UP_TO_DATE)
+
+
+def build_item(
+    item: TcSolution | TcPlcProject, repository_index: RepositoryIndex | None = None
+) -> tuple[bool, str]:
+    """Build a solution, or install a library PLC project (and refresh the
+    `repository_index`, if any). If it fails, return False and the reason why."""
+    if isinstance(item, TcSolution):
+        return tcbuild.build(item.filepath)
+    xae_project = item.parent
+    if xae_project is None or xae_project.parent is None:
+        raise ValueError(f"Unable to determine the solution of {item!r}")
+    return tcbuild.install(
+        xae_project.parent.filepath,
+        xae_project.filepath.stem,
+        item.filepath.stem,
+        repository_index=repository_index,
+    )
+
+
+BuildItem = TcSolution | TcPlcProject
+
+
+def _installed_libraries(
+    state: BuildState | None, repository: Iterable[TcLibraryReference] | None
+) -> LibraryIndex:
+    """Return the index of the installed libraries that the build `state` is checked
+    against. Without a state, the only accepted repository is a `RepositoryIndex`
+    (to refresh after installations)."""
+    if state is None:
+        if repository is not None and not isinstance(repository, RepositoryIndex):
+            raise ValueError("A library repository is only checked with a build state")
+        return LibraryIndex()
+    return LibraryIndex(get_library_repository() if repository is None else repository)
+
+
+class _BuildScheduler:  # pylint:disable=too-few-public-methods
+    """Runs the builds of a dependency tree on an executor. An item is built as soon as
+    all of its dependencies have been built successfully, unless it is up-to-date."""
+
+    def __init__(
+        self,
+        dependencies: dict[BuildItem, set[BuildItem]],
+        build: Callable[[BuildItem], tuple[bool, str]],
+        is_up_to_date: Callable[[BuildItem], bool],
+        on_success: Callable[[BuildItem], None],
+    ) -> None:
+        self.results: dict[BuildItem, BuildResult] = {}
+        self._dependencies = dependencies
+        (self._dependants, self._remaining) = get_dependants(dependencies)
+        self._build = build
+        self._is_up_to_date = is_up_to_date
+        self._on_success = on_success
+
+    def run(self, executor: Executor, fail_fast: bool) -> None:
+        """Build all items. When a build fails and `fail_fast` is True,
+        no new builds are started."""
+        aborted = False
+        running = self._submit(
+            executor, [item for item, count in self._remaining.items() if count == 0]
+        )
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            ready = []
+            for future in done:
+                item = running.pop(future)
+                try:
+                    (success, output) = future.result()
+                except (TcCliToolsException, OSError, ValueError) as exc:
+                    (success, output) = (False, str(exc))
+                if success:
+                    self._on_success(item)
+                    ready.extend(
+                        self._complete(item, BuildResult(BuildStatus.SUCCEEDED, output))
+                    )
+                else:
+                    self._complete(item, BuildResult(BuildStatus.FAILED, output))
+                    aborted = aborted or fail_fast
+            if not aborted:
+                running.update(self._submit(executor, ready))
+        self._skip_remaining(aborted)
+
+    def _complete(self, item: BuildItem, result: BuildResult) -> list[BuildItem]:
+        """Store the result of an item, and return the items that became ready"""
+        self.results[item] = result
+        ready = []
+        if result.success:
+            for dependant in self._dependants[item]:
+                self._remaining[dependant] -= 1
+                if self._remaining[dependant] == 0:
+                    ready.append(dependant)
+        return ready
+
+    def _submit(
+        self, executor: Executor, items: list[BuildItem]
+    ) -> dict[Future[tuple[bool, str]], BuildItem]:
+        """Start the builds of items that are ready, and return them by their future.
+        Up-to-date items are completed instead, which can make their dependants ready."""
+        started = {}
+        items = sorted(items, key=lambda item: str(item.filepath))
+        while items:
+            item = items.pop(0)
+            del self._remaining[item]
+            if self._is_up_to_date(item):
+                items.extend(self._complete(item, BuildResult(BuildStatus.UP_TO_DATE)))
+            else:
+                started[executor.submit(self._build, item)] = item
+        return started
+
+    def _skip_remaining(self, aborted: bool) -> None:
+        """Store the results of the items that have not been built"""
+        for item in self._remaining:
+            failed = [
+                dependency
+                for dependency in self._dependencies[item]
+                if dependency in self.results and not self.results[dependency].success
+            ]
+            if failed:
+                reason = f"Dependency failed: {failed[0]!r}"
+            elif aborted:
+                reason = "Build aborted after a failed build"
+            else:
+                reason = "Dependency skipped"
+            self.results[item] = BuildResult(BuildStatus.SKIPPED, reason)
+
+
+def execute_build(
+    tree: DependencyTree,
+    max_workers: int | None = None,
+    fail_fast: bool = True,
+    state: BuildState | None = None,
+    repository: Iterable[TcLibraryReference] | None = None,
+) -> dict[BuildItem, BuildResult]:
+    """Build all solutions in the dependency tree, running up to `max_workers`
+    builds concurrently. An item is built as soon as all of its dependencies have
+    been built successfully.
+
+    When a build fails and `fail_fast` is True, no new builds are started.
+    Otherwise, only the items that depend on the failed build are skipped.
+
+    When a build `state` is given, library PLC projects whose fingerprint is unchanged
+    since their last installation, and whose library version is still installed in
+    the library `repository` (defaults to the default library repository),
+    are not installed again. A `RepositoryIndex` repository is refreshed after
+    every installation; other repositories are only accepted with a build `state`."""
+    # Validate the build order (raises on missing libraries and cycles)
+    tree.get_build_waves()
+    tcbuild.is_available(raise_if_unavailable=True)
+
+    installed = _installed_libraries(state, repository)
+    fingerprints = get_fingerprints(tree) if state is not None else {}
+    repository_index = repository if isinstance(repository, RepositoryIndex) else None
+
+    def is_up_to_date(item: BuildItem) -> bool:
+        return (
+            state is not None
+            and isinstance(item, TcPlcProject)
+            and state.is_up_to_date(item, fingerprints[item], installed)
+        )
+
+    def on_success(item: BuildItem) -> None:
+        if state is not None and isinstance(item, TcPlcProject):
+            state.update(item, fingerprints[item])
+
+    scheduler = _BuildScheduler(
+        tree.get_build_dependencies(),
+        lambda item: build_item(item, repository_index),
+        is_up_to_date,
+        on_success,
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scheduler.run(executor, fail_fast)
+
+    if state is not None:
+        state.save()
+    return scheduler.results
+
+
+class _LibraryInstaller:  # pylint:disable=too-few-public-methods
+    """Installs library PLC projects one at a time, and skips redundant installations"""
+
+    def __init__(
+        self,
+        fail_fast: bool,
+        state: BuildState | None,
+        repository: Iterable[TcLibraryReference] | None,
+    ) -> None:
+        self.results: dict[TcPlcProject, BuildResult] = {}
+        self._fail_fast = fail_fast
+        self._aborted = False
+        self._state = state
+        self._installed = _installed_libraries(state, repository)
+        self._repository_index = (
+            repository if isinstance(repository, RepositoryIndex) else None
+        )
+        # The first project that provided a library version, by (library, fingerprint)
+        self._installed_by: dict[tuple[str, str], TcPlcProject] = {}
+
+    def install(
+        self,
+        plc_project: TcPlcProject,
+        project_fingerprint: str,
+        dependencies: set[BuildItem],
+    ) -> None:
+        """Install a library PLC project (unless it can be skipped),
+        and store the result"""
+        key = (str(plc_project.as_reference()), project_fingerprint)
+        result = self._install(plc_project, key, dependencies)
+        self.results[plc_project] = result
+        if result.success:
+            self._installed_by.setdefault(key, plc_project)
+            if self._state is not None:
+                self._state.update(plc_project, project_fingerprint)
+        elif result.status == BuildStatus.FAILED:
+            self._aborted = self._fail_fast
+
+    def _install(
+        self,
+        plc_project: TcPlcProject,
+        key: tuple[str, str],
+        dependencies: set[BuildItem],
+    ) -> BuildResult:
+        """Install a library PLC project if it is not skipped, deduplicated
+        or up-to-date, and return the result"""
+        failed = [
+            dependency
+            for dependency in dependencies
+            if isinstance(dependency, TcPlcProject)
+            and not self.results[dependency].success
+        ]
+        if failed:
+            return BuildResult(BuildStatus.SKIPPED, f"Dependency failed: {failed[0]!r}")
+        if self._aborted:
+            return BuildResult(
+                BuildStatus.SKIPPED, "Installation aborted after a failed installation"
+            )
+        if key in self._installed_by:
+            return BuildResult(
+                BuildStatus.UP_TO_DATE, f"Installed by {self._installed_by[key]!r}"
+            )
+        if self._state is not None and self._state.is_up_to_date(
+            plc_project, key[1], self._installed
+        ):
+            return BuildResult(BuildStatus.UP_TO_DATE)
+        try:
+            (success, output) = build_item(plc_project, self._repository_index)
+        except (TcCliToolsException, OSError, ValueError) as exc:
+            (success, output) = (False, str(exc))
+        return BuildResult(
+            BuildStatus.SUCCEEDED if success else BuildStatus.FAILED, output
+        )
+
+
+def install_libraries(
+    trees: Iterable[DependencyTree],
+    fail_fast: bool = True,
+    state: BuildState | None = None,
+    repository: Iterable[TcLibraryReference] | None = None,
+) -> dict[TcPlcProject, BuildResult]:
+    """Install the library PLC projects of one or more dependency trees, in build
+    order, with at most one TcBuild invocation per distinct library.
+
+    A library PLC project is not installed again when it (or another project with the
+    same library version and identical content, i.e. the same fingerprint) has already
+    been installed for an earlier tree, or when a build `state` is given and the
+    project is up-to-date (see `execute_build`). Projects that depend on a failed
+    installation are skipped, as are all remaining projects after a failure when
+    `fail_fast` is True.
+
+    Only the build state records the content of installed libraries, so without a
+    `state` the library `repository` can only be a `RepositoryIndex` (which is
+    refreshed after every installation)."""
+    trees = list(trees)
+    for tree in trees:
+        # Validate the build order (raises on missing libraries and cycles)
+        tree.get_build_waves()
+    tcbuild.is_available(raise_if_unavailable=True)
+    installer = _LibraryInstaller(fail_fast, state, repository)
+
+    for tree in trees:
+        dependencies = tree.get_build_dependencies()
+        for plc_project, project_fingerprint in get_fingerprints(tree).items():
+            if plc_project not in installer.results:
+                installer.install(
+                    plc_project, project_fingerprint, dependencies[plc_project]
+                )
+
+    if state is not None:
+        state.save()
+    return installer.results
@@ -0,0 +1,103 @@
+"""Content fingerprints of PLC projects and the state of previous builds"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .dependencytree import DependencyTree
+from .libraryindex import LibraryIndex
+from .tcplcproject import TcPlcProject
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 digest of a file, or an empty string if it does not exist"""
+    sha = hashlib.sha256()
+    try:
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                sha.update(chunk)
+    except FileNotFoundError:
+        return ""
+    return sha.hexdigest()
+
+
+def fingerprint(plc_project: TcPlcProject, dependencies: Iterable[str]) -> str:
+    """Return the fingerprint of a PLC project: a hash of the project file,
+    its source files and the fingerprints of its (resolved) dependencies"""
+    sha = hashlib.sha256()
+    sha.update(file_digest(plc_project.filepath).encode())
+    root = plc_project.filepath.parent
+    for source_file in sorted(plc_project.source_files):
+        relative_path = source_file.relative_to(root).as_posix()
+        sha.update(f"\n{relative_path}:{file_digest(source_file)}".encode())
+    for dependency in sorted(dependencies):
+        sha.update(f"\n{dependency}".encode())
+    return sha.hexdigest()
+
+
+def get_fingerprints(tree: DependencyTree) -> dict[TcPlcProject, str]:
+    """Return the fingerprints of all library PLC projects in the dependency tree.
+
+    A dependency on a library PLC project contributes its fingerprint,
+    other dependencies contribute the full name of the resolved library."""
+    fingerprints: dict[TcPlcProject, str] = {}
+    for item in tree.get_build_order():
+        if not isinstance(item, TcPlcProject):
+            continue
+        dependencies = []
+        for reference in tree.graph.dependencies(item):
+            dependency = str(tree.library_index.resolve(reference))
+            for library in tree.graph.dependencies(reference):
+                if isinstance(library, TcPlcProject):
+                    dependency = fingerprints.get(library, dependency)
+            dependencies.append(dependency)
+        fingerprints[item] = fingerprint(item, dependencies)
+    return fingerprints
+
+
+class BuildState:
+    """A local store of the fingerprints of installed library PLC projects"""
+
+    def __init__(self, path: Path) -> None:
+        """Load the build state from `path` (if it exists)"""
+        self.path = path
+        self._projects: dict[str, dict[str, str]] = {}
+        if path.exists():
+            self._projects = json.loads(path.read_text(encoding="utf-8"))
+
+    def is_up_to_date(
+        self,
+        plc_project: TcPlcProject,
+        project_fingerprint: str,
+        repository: LibraryIndex,
+    ) -> bool:
+        """Return True if the PLC project has been installed with the same fingerprint,
+        and the installed library version is still available in the repository"""
+        state = self._projects.get(str(plc_project.filepath))
+        reference = plc_project.as_reference()
+        if state is None or reference is None:
+            return False
+        installed = repository.resolve(reference)
+        return (
+            state["fingerprint"] == project_fingerprint
+            and state["library"] == str(reference)
+            and installed is not None
+            and not installed.is_any_version()
+        )
+
+    def update(self, plc_project: TcPlcProject, project_fingerprint: str) -> None:
+        """Store the fingerprint of an installed PLC project"""
+        self._projects[str(plc_project.filepath)] = {
+            "fingerprint": project_fingerprint,
+            "library": str(plc_project.as_reference()),
+        }
+
+    def save(self) -> None:
+        """Write the build state to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(json.dumps(self._projects, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.path)
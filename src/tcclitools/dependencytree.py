@@ -1,29 +1,41 @@
 """A dependency tree of a TwinCAT solution"""
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Iterable
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Sequence,
+    TextIO,
+    TypeVar,
+)
 
-from anytree import LevelOrderGroupIter, NodeMixin, RenderTree
+from anytree import NodeMixin
 
-from .exceptions import MissingLibrariesError
+from .exceptions import CircularDependencyError, MissingLibrariesError
+from .filewalker import DEFAULT_IGNORE_PATTERNS, IgnoreRules, walk
+from .libraryindex import LibraryIndex
+from .registry import load
 from .tclibraryreference import TcLibraryReference
 from .tcplcproject import TcPlcProject
 from .tcrepolibrary import TcRepoLibrary
 from .tcsolution import TcSolution
 from .tcxaeproject import TcXaeProject
 
+TcObject = TcSolution | TcXaeProject | TcPlcProject | TcLibraryReference | TcRepoLibrary
+T = TypeVar("T", bound=Hashable)
+
 
 class TcNode(NodeMixin):  # type:ignore
     """An AnyTree node with custom property for the TwinCAT object it references"""
 
     def __init__(
         self,
-        origin: TcSolution
-        | TcXaeProject
-        | TcPlcProject
-        | TcLibraryReference
-        | TcRepoLibrary,
+        origin: TcObject,
         parent: TcNode | None = None,
         children: list[TcNode] | None = None,
     ) -> None:
@@ -34,6 +46,52 @@ class TcNode(NodeMixin):  # type:ignore
             self.children = children
 
 
+class DependencyGraph:
+    """A dependency graph of TwinCAT objects.
+
+    Every object is a single vertex that is shared by all of its dependants,
+    so the size of the graph scales with the number of unique objects
+    instead of the number of paths to them."""
+
+    def __init__(self) -> None:
+        self._vertices: dict[Hashable, TcObject] = {}
+        self._edges: dict[Hashable, list[Hashable]] = {}
+
+    @staticmethod
+    def key(origin: TcObject) -> Hashable:
+        """Return the key of the vertex of a TwinCAT object.
+        Library references are identified by their full name, other objects by their path"""
+        if isinstance(origin, TcLibraryReference):
+            return str(origin)
+        return origin.filepath
+
+    def add_vertex(self, origin: TcObject) -> bool:
+        """Add a vertex for `origin`. Return False if the vertex already exists"""
+        key = self.key(origin)
+        if key in self._vertices:
+            return False
+        self._vertices[key] = origin
+        self._edges[key] = []
+        return True
+
+    def add_edge(self, origin: TcObject, dependency: TcObject) -> None:
+        """Add a dependency of `origin` (`origin` must already be a vertex)"""
+        self._edges[self.key(origin)].append(self.key(dependency))
+
+    def dependencies(self, origin: TcObject) -> list[TcObject]:
+        """Return the direct dependencies of `origin`"""
+        return [self._vertices[key] for key in self._edges[self.key(origin)]]
+
+    def __contains__(self, origin: object) -> bool:
+        return self.key(origin) in self._vertices  # type:ignore
+
+    def __iter__(self) -> Iterator[TcObject]:
+        return iter(self._vertices.values())
+
+    def __len__(self) -> int:
+        return len(self._vertices)
+
+
 class DependencyTree:
     """A dependency tree of a TwinCAT solution"""
 
@@ -46,141 +104,311 @@ class DependencyTree:
         """Build a dependency tree for `root_solution`.
         The required libraries will be retrieved from `libraries`"""
 
-        # Extract library references from the 'libraries' argument
-        library_references = []
+        # Index the library references of the 'libraries' argument
+        library_index = LibraryIndex()
         library_plc_projects: dict[TcLibraryReference, TcPlcProject] = {}
         if libraries:
             for item in libraries:
                 if isinstance(item, TcSolution):
                     # Get all library projects in the solution
-                    projects: set[TcPlcProject] = {
-                        proj
-                        for proj in item.plc_projects
-                        if proj.as_reference() is not None
-                    }
-                    for project in projects:
-                        library_references.append(project.as_reference())
-                        library_plc_projects[
-                            project.as_reference()  # type:ignore
-                        ] = project
+                    for project in set(item.plc_projects):
+                        reference = project.as_reference()
+                        if reference is not None:
+                            library_index.add(reference)
+                            library_plc_projects[reference] = project
                 elif isinstance(item, TcRepoLibrary):
-                    library_references.append(item.as_reference())
+                    library_index.add(item.as_reference())
                 elif isinstance(item, TcLibraryReference):
-                    library_references.append(item)
+                    library_index.add(item)
                 else:
                     raise NotImplementedError(
                         f"Cannot extract library references of {type(item)} objects"
                     )
-        # make unique
-        library_references: set[TcLibraryReference] = set(  # type:ignore
-            library_references
-        )
 
         missing_libraries: list[TcLibraryReference] = []
+        self.graph = DependencyGraph()
 
-        def traverse(node: TcNode) -> None:
-            """Recursively create child nodes for all library references in the parent node"""
-            origin = node.origin
+        def get_dependencies(origin: TcObject) -> Iterable[TcObject]:
+            """Return the direct dependencies of `origin`"""
             if isinstance(origin, TcSolution):
-                for plcproject in origin.xae_projects:
-                    traverse(TcNode(plcproject, parent=node))
-            elif isinstance(origin, TcXaeProject):
-                for xaeproject in origin.plc_projects:
-                    traverse(
-                        TcNode(
-                            xaeproject,
-                            parent=node,
-                        )
-                    )
-            elif isinstance(origin, TcPlcProject):
-                for reference in origin.library_references:
-                    traverse(
-                        TcNode(
-                            reference,
-                            parent=node,
-                        )
-                    )
-            elif isinstance(origin, TcLibraryReference):
-                # Get available libraries, sort them so that the newest version is the
-                # first item in the list
-                matching_libraries = sorted(
-                    [lib for lib in library_references if lib == origin],
-                    key=lambda lib: lib.version,
-                    reverse=True,
-                )
-                if matching_libraries:
-                    # It is, now check if the library reference is based on a PLC project.
-                    # If so, traverse the dependencies of that solution
-                    matching_library = matching_libraries[0]
-                    if matching_library in library_plc_projects:
-                        traverse(
-                            TcNode(
-                                library_plc_projects[matching_library],
-                                parent=node,
-                            )
-                        )
-                else:
+                return origin.xae_projects
+            if isinstance(origin, TcXaeProject):
+                return origin.plc_projects
+            if isinstance(origin, TcPlcProject):
+                return origin.library_references
+            if isinstance(origin, TcLibraryReference):
+                # Get the newest available library that matches the reference
+                matching_library = library_index.resolve(origin)
+                if matching_library is None:
                     # Library is missing
                     missing_libraries.append(origin)
-            elif isinstance(node.origin, TcRepoLibrary):
+                elif matching_library in library_plc_projects:
+                    # The library is based on a PLC project,
+                    # traverse the dependencies of that project
+                    return [library_plc_projects[matching_library]]
+                return []
+            if isinstance(origin, TcRepoLibrary):
                 # No further dependencies (end of this branch)
-                return
-            else:
-                raise NotImplementedError(
-                    f"Cannot create dependency tree for {type(node.origin)} objects"
+                return []
+            raise NotImplementedError(
+                f"Cannot create dependency tree for {type(origin)} objects"
+            )
+
+        self._traverse(solution, get_dependencies)
+
+        self.solution = solution
+        self.library_index = library_index
+        self._trunk: TcNode | None = None
+
+        # Deduplicate by version: an any-version reference equals all versions
+        self.missing_libraries = set(
+            {
+                (reference.key, reference.version_key): reference
+                for reference in missing_libraries
+            }.values()
+        )
+
+    def _traverse(
+        self,
+        solution: TcSolution,
+        get_dependencies: Callable[[TcObject], Iterable[TcObject]],
+    ) -> None:
+        """Add the solution and all of its (transitive) dependencies to the graph"""
+        # Depth-first traversal with an explicit stack (the current path).
+        # Vertices that have already been traversed are shared, not traversed again
+        self.graph.add_vertex(solution)
+        path: list[tuple[TcObject, Iterator[TcObject]]] = [
+            (solution, iter(get_dependencies(solution)))
+        ]
+        path_keys = {self.graph.key(solution)}
+        while path:
+            (origin, dependencies) = path[-1]
+            dependency = next(dependencies, None)
+            if dependency is None:
+                path.pop()
+                path_keys.discard(self.graph.key(origin))
+                continue
+            self.graph.add_edge(origin, dependency)
+            if self.graph.key(dependency) in path_keys:
+                keys = [self.graph.key(item) for (item, _) in path]
+                start = keys.index(self.graph.key(dependency))
+                chain = [item for (item, _) in path[start:]] + [dependency]
+                raise CircularDependencyError(
+                    "Circular dependency: " + " -> ".join(str(item) for item in chain)
                 )
+            if self.graph.add_vertex(dependency):
+                path.append((dependency, iter(get_dependencies(dependency))))
+                path_keys.add(self.graph.key(dependency))
+
+    @property
+    def trunk(self) -> TcNode:
+        """The dependency tree as a tree of TcNodes, derived from the dependency graph.
 
-        self.trunk = TcNode(solution)
-        traverse(self.trunk)
+        Shared dependencies are copied for every path they can be reached by,
+        so the tree is only created when it is requested."""
+        if self._trunk is None:
 
-        self.missing_libraries = set(missing_libraries)
+            self._trunk = TcNode(self.solution)
+            nodes = [self._trunk]
+            while nodes:
+                node = nodes.pop()
+                for dependency in self.graph.dependencies(node.origin):
+                    nodes.append(TcNode(dependency, parent=node))
+        return self._trunk
 
     def __str__(self) -> str:
         """Return the dependency tree as a printable tree structure"""
-        return render_tree(self.trunk)
+        stream = io.StringIO()
+        self.write(stream)
+        return stream.getvalue()
 
-    def get_build_order(self) -> list[TcSolution | TcPlcProject]:
-        """Return the build order of all solutions in the dependency tree"""
+    def write(
+        self, stream: TextIO, max_depth: int | None = None, deduplicate: bool = False
+    ) -> None:
+        """Write the dependency tree as a printable tree structure to `stream`,
+        directly from the dependency graph. See `write_tree` for the arguments."""
+        _write_tree(
+            stream,
+            self.solution,
+            lambda origin: (origin, self.graph.dependencies(origin)),
+            max_depth,
+            deduplicate,
+        )
+
+    def get_build_dependencies(
+        self,
+    ) -> dict[TcSolution | TcPlcProject, set[TcSolution | TcPlcProject]]:
+        """Return the build dependencies of all solutions in the dependency tree.
+
+        Library PLC projects are built individually, PLC projects that are part of
+        the trunk are built as part of the solution itself."""
+        trunk_projects = {
+            plc_project
+            for xae_project in self.graph.dependencies(self.solution)
+            for plc_project in self.graph.dependencies(xae_project)
+        }
+
+        def build_unit(plc_project: TcPlcProject) -> TcSolution | TcPlcProject:
+            return self.solution if plc_project in trunk_projects else plc_project
+
+        dependencies: dict[TcSolution | TcPlcProject, set[TcSolution | TcPlcProject]]
+        dependencies = {self.solution: set()}
+        for vertex in self.graph:
+            if not isinstance(vertex, TcPlcProject):
+                continue
+            unit = build_unit(vertex)
+            unit_dependencies = dependencies.setdefault(unit, set())
+            for reference in self.graph.dependencies(vertex):
+                for library in self.graph.dependencies(reference):
+                    dependency = build_unit(library)  # type:ignore
+                    if dependency is not unit or unit is not self.solution:
+                        unit_dependencies.add(dependency)
+        return dependencies
+
+    def get_build_waves(self) -> list[list[TcSolution | TcPlcProject]]:
+        """Return the build order of all solutions in the dependency tree, grouped in
+        waves. The items in a wave do not depend on each other (they can be built
+        concurrently), but only on items in previous waves."""
 
         if self.missing_libraries:
             raise MissingLibrariesError(
                 f"Unable to generate build order, missing libraries: {self.missing_libraries}"
             )
 
-        # Group PLC projects in the tree by tree depth.
-        # Result is reversed to get deepest level first).
-        # https://anytree.readthedocs.io/en/latest/api/anytree.iterators.html#anytree.iterators.levelordergroupiter.LevelOrderGroupIter
-        levels = [
-            [node.origin for node in children if isinstance(node.origin, TcPlcProject)]
-            for children in LevelOrderGroupIter(self.trunk)
-        ][::-1]
+        # Topological sort (Kahn's algorithm), one wave at a time
+        dependencies = self.get_build_dependencies()
+        (dependants, remaining) = get_dependants(dependencies)
+
+        waves = []
+        wave = [unit for unit, count in remaining.items() if count == 0]
+        while wave:
+            wave.sort(key=lambda unit: str(unit.filepath))
+            waves.append(wave)
+            next_wave = []
+            for unit in wave:
+                del remaining[unit]
+                for dependant in dependants[unit]:
+                    remaining[dependant] -= 1
+                    if remaining[dependant] == 0:
+                        next_wave.append(dependant)
+            wave = next_wave
+
+        if remaining:
+            raise CircularDependencyError(
+                "Unable to generate build order, circular dependency: "
+                + " -> ".join(
+                    repr(unit) for unit in _find_cycle(dependencies, set(remaining))
+                )
+            )
+        return waves
+
+    def get_build_order(self) -> list[TcSolution | TcPlcProject]:
+        """Return the build order of all solutions in the dependency tree"""
+        return [unit for wave in self.get_build_waves() for unit in wave]
 
-        # Generate build order, filter builds that have already been done
-        # and PLC projects that are part of the trunk (will always be built)
-        build_order = []
-        for plc_projects in levels:
-            for plc_project in plc_projects:
-                if (
-                    plc_project not in build_order
-                    and plc_project.parent.parent != self.trunk.origin  # type:ignore
-                ):
-                    build_order.append(plc_project)
 
-        # add the last build: the solution itself
-        build_order.extend([self.trunk.origin])  # type:ignore
+def get_dependants(
+    dependencies: dict[T, set[T]]
+) -> tuple[dict[T, list[T]], dict[T, int]]:
+    """Return the items that depend on every item, and the number of dependencies
+    of every item (as used for a topological sort)"""
+    dependants: dict[T, list[T]] = {item: [] for item in dependencies}
+    counts = {}
+    for item, item_dependencies in dependencies.items():
+        counts[item] = len(item_dependencies)
+        for dependency in item_dependencies:
+            dependants[dependency].append(item)
+    return (dependants, counts)
 
-        return build_order
+
+def _find_cycle(dependencies: dict[Any, set[Any]], candidates: set[Any]) -> list[Any]:
+    """Return a dependency cycle (first item equals the last item) within `candidates`.
+    Every candidate must have at least one dependency that is also a candidate."""
+    path: list[Any] = []
+    visited: dict[Any, int] = {}
+    item = next(iter(candidates))
+    while item not in visited:
+        visited[item] = len(path)
+        path.append(item)
+        item = next(
+            dependency for dependency in dependencies[item] if dependency in candidates
+        )
+    return path[visited[item] :] + [item]
 
 
-def get_all_solutions(path: Path) -> Iterable[TcSolution]:
-    """Return all solutions in a folder (including subfolders)"""
-    for solution_path in path.glob("**/*.sln"):
-        yield TcSolution(path=solution_path)
+def get_all_solutions(
+    path: Path, ignore: IgnoreRules | None = None
+) -> Iterable[TcSolution]:
+    """Return all solutions in a folder (including subfolders).
+    Folders matching the `ignore` rules (defaults to generated folders
+    such as `_Boot`, `bin` and `.git`) are skipped."""
+    if ignore is None:
+        ignore = IgnoreRules(DEFAULT_IGNORE_PATTERNS)
+    for entry in walk(path, "*.sln", ignore):
+        yield load(TcSolution, Path(entry.path), stat_result=entry.stat())
 
 
 def render_tree(trunk: TcNode) -> str:
     """Render a tree of TcNodes to a human readable string"""
-    tree_str = ""
-    for pre, _, node in RenderTree(trunk):
-        tree_str += f"{pre}{node.origin}\n"
-    return tree_str
+    stream = io.StringIO()
+    write_tree(trunk, stream)
+    return stream.getvalue()
+
+
+def write_tree(
+    trunk: TcNode,
+    stream: TextIO,
+    max_depth: int | None = None,
+    deduplicate: bool = False,
+) -> None:
+    """Write a tree of TcNodes to a text stream, one line per node.
+
+    Nodes deeper than `max_depth` (the trunk has depth 0) are omitted. When
+    `deduplicate` is True, a subtree is only written once: any following occurrences
+    are written as a single line with a back-reference."""
+    _write_tree(
+        stream, trunk, lambda node: (node.origin, node.children), max_depth, deduplicate
+    )
+
+
+def _write_tree(
+    stream: TextIO,
+    trunk: Any,
+    get_node: Callable[[Any], tuple[TcObject, Sequence[Any]]],
+    max_depth: int | None,
+    deduplicate: bool,
+) -> None:
+    """Write a tree to a text stream (in the style of `anytree.RenderTree`).
+    `get_node(item)` returns the TwinCAT object and the children of a tree item."""
+    written: set[Hashable] = set()
+    # Items to write: (item, prefix of the item, prefix of its children, depth)
+    stack: list[tuple[Any, str, str, int]] = [(trunk, "", "", 0)]
+    while stack:
+        (item, prefix, children_prefix, depth) = stack.pop()
+        (origin, children) = get_node(item)
+        if max_depth is not None and depth >= max_depth:
+            children = []
+        if deduplicate and children:
+            key = DependencyGraph.key(origin)
+            if key in written:
+                stream.write(f"{prefix}{origin} [see above]\n")
+                continue
+            written.add(key)
+        stream.write(f"{prefix}{origin}\n")
+        _push_children(stack, children, children_prefix, depth + 1)
+
+
+def _push_children(
+    stack: list[tuple[Any, str, str, int]],
+    children: Sequence[Any],
+    prefix: str,
+    depth: int,
+) -> None:
+    """Push the children of a tree item on the stack of `_write_tree`,
+    so they are popped in order"""
+    for index in reversed(range(len(children))):
+        if index == len(children) - 1:
+            (branch, continuation) = ("└── ", "    ")
+        else:
+            (branch, continuation) = ("├── ", "│   ")
+        stack.append((children[index], prefix + branch, prefix + continuation, depth))
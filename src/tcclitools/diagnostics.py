@@ -0,0 +1,128 @@
+"""Structured diagnostics from TcBuild and TwinCAT compiler output"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterable, Iterator
+
+from .exceptions import BuildAbortedError
+
+
+class Severity(Enum):
+    """Severity of a diagnostic"""
+
+    ERROR = "error"
+    WARNING = "warning"
+    INFO = "info"
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """A diagnostic message of a build"""
+
+    severity: Severity
+    message: str
+    project: str | None = None
+    file: str | None = None
+    line: int | None = None
+    code: str | None = None
+
+    def __str__(self) -> str:
+        location = self.file or self.project or ""
+        if self.file and self.line is not None:
+            location += f"({self.line})"
+        code = f" {self.code}" if self.code else ""
+        prefix = f"{location}: " if location else ""
+        return f"{prefix}{self.severity.value}{code}: {self.message}"
+
+
+# A project (or PLC application) build header, e.g.
+# `------ Build started: Project: PLC1, Configuration: Release TwinCAT RT (x64) ------`
+_RE_PROJECT = re.compile(
+    r"(?:Build|Rebuild All) started:\s*(?:Project|Application):\s*(?P<project>[^,]+?)"
+    r"(?:\s+Project)?\s*(?:,|-{2,}|$)",
+    re.IGNORECASE,
+)
+# A (located) diagnostic in the canonical MSBuild format, e.g.
+# `C:\Plc\POUs\MAIN.TcPOU(12,5): error C0046: Identifier 'x' not defined [C:\Plc\Plc.plcproj]`
+_RE_DIAGNOSTIC = re.compile(
+    r"^\s*(?:\d+>)?"
+    r"(?:(?P<file>.+?)(?:\((?P<line>\d+)(?:,\d+)*\))?\s*:\s*)?"
+    r"(?P<severity>error|warning|message|info)\b"
+    r"(?:\s*:\s*(?P<code>[A-Za-z]+\d+)\s*:|\s*(?P<code_>[A-Za-z]+\d+)?\s*:)\s*"
+    r"(?P<message>.*?)(?:\s+\[(?P<project>[^\]]+)\])?\s*$",
+    re.IGNORECASE,
+)
+_SEVERITIES = {
+    "error": Severity.ERROR,
+    "warning": Severity.WARNING,
+    "message": Severity.INFO,
+    "info": Severity.INFO,
+}
+
+
+class DiagnosticsParser:
+    """An incremental parser that turns TcBuild output lines into diagnostics.
+
+    Lines are parsed one at a time (in constant memory), so the parser can be fed
+    while TcBuild is running. Every diagnostic is passed to `on_diagnostic`.
+    When `fail_fast` is True, the first error raises BuildAbortedError."""
+
+    def __init__(
+        self,
+        on_diagnostic: Callable[[Diagnostic], None] | None = None,
+        fail_fast: bool = False,
+    ) -> None:
+        self.on_diagnostic = on_diagnostic
+        self.fail_fast = fail_fast
+        self.project: str | None = None
+        self.errors = 0
+        self.warnings = 0
+        self.first_error: Diagnostic | None = None
+
+    def feed(self, line: str) -> Diagnostic | None:
+        """Parse an output line, and return its diagnostic (if any)"""
+        match = _RE_PROJECT.search(line)
+        if match:
+            self.project = match.group("project")
+            return None
+        match = _RE_DIAGNOSTIC.match(line)
+        if not match:
+            return None
+        project = match.group("project")
+        if project:
+            # MSBuild appends the project file, e.g. `[C:\Plc\Plc.plcproj]`
+            project = re.split(r"[\\/]", project)[-1].rsplit(".", 1)[0]
+        diagnostic = Diagnostic(
+            severity=_SEVERITIES[match.group("severity").lower()],
+            message=match.group("message"),
+            project=project or self.project,
+            file=match.group("file"),
+            line=int(match.group("line")) if match.group("line") else None,
+            code=match.group("code") or match.group("code_"),
+        )
+        if diagnostic.severity == Severity.ERROR:
+            self.errors += 1
+            if self.first_error is None:
+                self.first_error = diagnostic
+        elif diagnostic.severity == Severity.WARNING:
+            self.warnings += 1
+        if self.on_diagnostic is not None:
+            self.on_diagnostic(diagnostic)
+        if self.fail_fast and diagnostic.severity == Severity.ERROR:
+            raise BuildAbortedError(f"Build aborted on the first error: {diagnostic}")
+        return diagnostic
+
+    def on_line(self, stream: str, line: str) -> None:  # pylint:disable=unused-argument
+        """Parse a line of streamed TcBuild output (see `tcbuild.run_streaming`)"""
+        self.feed(line)
+
+
+def parse_diagnostics(lines: Iterable[str]) -> Iterator[Diagnostic]:
+    """Return the diagnostics in TcBuild output lines (e.g., of a log file)"""
+    parser = DiagnosticsParser()
+    for line in lines:
+        diagnostic = parser.feed(line)
+        if diagnostic is not None:
+            yield diagnostic
@@ -9,9 +9,21 @@ class MissingLibrariesError(TcCliToolsException):
     """Missing libraries exception"""
 
 
+class CircularDependencyError(TcCliToolsException):
+    """Circular dependency exception"""
+
+
 class InvalidLibraryError(TcCliToolsException):
     """Invalid library exception"""
 
 
 class TcBuildInvokeError(TcCliToolsException):
     """Error when invoking TcBuild"""
+
+
+class TcBuildTimeoutError(TcBuildInvokeError):
+    """TcBuild did not finish in time"""
+
+
+class BuildAbortedError(TcCliToolsException):
+    """A build was aborted before TcBuild finished"""
@@ -0,0 +1,102 @@
+"""A pruned directory walker for discovering TwinCAT files"""
+from __future__ import annotations
+
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Generated (and version control) folders that never contain solutions
+DEFAULT_IGNORE_PATTERNS = (
+    ".git/",
+    ".vs/",
+    "_Boot/",
+    "_CompileInfo/",
+    "_Libraries/",
+    "bin/",
+    "obj/",
+)
+
+
+class IgnoreRules:
+    """Rules for the files and folders to skip while walking a directory tree.
+
+    Patterns use the `.gitignore` syntax: a pattern with a trailing slash only
+    matches folders, a pattern with a leading or middle slash matches the path
+    relative to the walked folder (otherwise only the name is matched), and
+    a leading `!` re-includes a path excluded by a previous pattern."""
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self._rules: list[tuple[str, bool, bool, bool]] = []
+        for pattern in patterns:
+            self.add(pattern)
+
+    @classmethod
+    def from_file(
+        cls, path: Path, defaults: Iterable[str] = DEFAULT_IGNORE_PATTERNS
+    ) -> IgnoreRules:
+        """Create rules from the `defaults` and the patterns of a `.gitignore`-style file"""
+        rules = cls(defaults)
+        with path.open("r", encoding="utf-8") as file:
+            for line in file:
+                rules.add(line)
+        return rules
+
+    def add(self, pattern: str) -> None:
+        """Add a pattern (blank lines and comments are ignored)"""
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            return
+        negate = pattern.startswith("!")
+        pattern = pattern.lstrip("!")
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        self._rules.append((pattern.lstrip("/"), negate, dir_only, anchored))
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        """Return True if a path (relative to the walked folder, with forward
+        slashes) is ignored. The last matching pattern decides."""
+        name = relative_path.rsplit("/", 1)[-1]
+        ignored = False
+        for (pattern, negate, dir_only, anchored) in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if fnmatch(relative_path if anchored else name, pattern):
+                ignored = not negate
+        return ignored
+
+
+def walk(
+    root: Path,
+    pattern: str,
+    ignore: IgnoreRules | None = None,
+    max_depth: int | None = None,
+) -> Iterator[os.DirEntry[str]]:
+    """Yield the files in `root` and its subfolders whose name matches `pattern`.
+
+    Ignored folders are not entered, and folders more than `max_depth` levels
+    below `root` are not scanned (0 only scans `root` itself). The `DirEntry`
+    objects are yielded, so their cached file type and stat information can be reused."""
+    ignore = ignore or IgnoreRules()
+    stack: list[tuple[str, str, int]] = [(str(root), "", 0)]
+    while stack:
+        (directory, relative_directory, depth) = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        subdirectories = []
+        for entry in entries:
+            relative_path = relative_directory + entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if ignore.is_ignored(relative_path, is_dir):
+                continue
+            if is_dir:
+                if max_depth is None or depth < max_depth:
+                    subdirectories.append((entry.path, relative_path + "/", depth + 1))
+            elif fnmatch(entry.name, pattern):
+                yield entry
+        # Walk the subfolders in alphabetical order
+        stack.extend(reversed(subdirectories))
@@ -0,0 +1,130 @@
+"""An index of available TwinCAT libraries"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from .tclibraryreference import TcLibraryReference
+
+
+@dataclass
+class Resolution:
+    """The result of resolving many library references against a library index.
+
+    The results are lists of pairs instead of dictionaries, as an any-version
+    reference is equal to every version of the library."""
+
+    # (reference, library) pairs
+    resolved: list[tuple[TcLibraryReference, TcLibraryReference]] = field(
+        default_factory=list
+    )
+    missing: list[TcLibraryReference] = field(default_factory=list)
+    # (reference, versions) pairs of the any-version references that match
+    # several versions (they are resolved to the newest version)
+    ambiguous: list[tuple[TcLibraryReference, list[TcLibraryReference]]] = field(
+        default_factory=list
+    )
+
+
+class LibraryIndex:
+    """An index of available TwinCAT libraries, grouped by title and company.
+
+    The versions of each library are kept sorted (newest first), so resolving
+    a library reference does not require a scan of all available libraries."""
+
+    def __init__(self, references: Iterable[TcLibraryReference] | None = None) -> None:
+        self._versions: dict[tuple[str, str], list[TcLibraryReference]] = {}
+        self._exact: dict[
+            tuple[tuple[str, str], tuple[int, ...]], TcLibraryReference
+        ] = {}
+        self._any_version: dict[tuple[str, str], TcLibraryReference] = {}
+        self._unsorted: set[tuple[str, str]] = set()
+        if references:
+            for reference in references:
+                self.add(reference)
+
+    @staticmethod
+    def key(reference: TcLibraryReference) -> tuple[str, str]:
+        """Return the normalized (title, company) key of a library reference"""
+        return reference.key
+
+    def add(self, reference: TcLibraryReference) -> None:
+        """Add an available library to the index"""
+        key = self.key(reference)
+        if reference.is_any_version():
+            self._any_version.setdefault(key, reference)
+            return
+        if (key, reference.version_key) not in self._exact:
+            self._exact[(key, reference.version_key)] = reference
+            self._versions.setdefault(key, []).append(reference)
+            self._unsorted.add(key)
+
+    def versions(self, reference: TcLibraryReference) -> list[TcLibraryReference]:
+        """Return all available versions of a library, newest version first"""
+        key = self.key(reference)
+        if key in self._unsorted:
+            self._versions[key].sort(key=lambda lib: lib.version_key, reverse=True)
+            self._unsorted.discard(key)
+        return self._versions.get(key, [])
+
+    def resolve(self, reference: TcLibraryReference) -> TcLibraryReference | None:
+        """Return the available library that matches `reference`, or None if
+        it is missing. Any-version (`*`) references resolve to the newest version."""
+        key = self.key(reference)
+        if reference.is_any_version():
+            versions = self.versions(reference)
+            if versions:
+                return versions[0]
+        else:
+            library = self._exact.get((key, reference.version_key))
+            if library is not None:
+                return library
+        return self._any_version.get(key)
+
+    def resolve_all(self, references: Iterable[TcLibraryReference]) -> Resolution:
+        """Resolve many library references in one pass.
+        Each library is only sorted once, and references that occur more than once
+        (e.g., the placeholders of all PLC projects in a workspace) are resolved once."""
+        resolution = Resolution()
+        seen = set()
+        for reference in references:
+            if (reference.key, reference.version_key) in seen:
+                continue
+            seen.add((reference.key, reference.version_key))
+            library = self.resolve(reference)
+            if library is None:
+                resolution.missing.append(reference)
+                continue
+            resolution.resolved.append((reference, library))
+            if reference.is_any_version() and len(self.versions(reference)) > 1:
+                resolution.ambiguous.append((reference, self.versions(reference)))
+        return resolution
+
+    def __contains__(self, reference: object) -> bool:
+        if not isinstance(reference, TcLibraryReference):
+            return False
+        return self.resolve(reference) is not None
+
+    def __iter__(self) -> Iterator[TcLibraryReference]:
+        for versions in self._versions.values():
+            yield from versions
+        yield from self._any_version.values()
+
+    def __len__(self) -> int:
+        return len(self._exact) + len(self._any_version)
+
+
+class LayeredRepository(LibraryIndex):
+    """A library index that merges several library sources in priority order,
+    such as installed library repositories (`get_library_repository()` or a
+    `RepositoryIndex`) and the libraries of other solutions.
+
+    A library version that is available from several sources is taken from the
+    first source, so resolving a reference returns the library object of the
+    source it is provided by."""
+
+    def __init__(self, sources: Iterable[Iterable[TcLibraryReference]]) -> None:
+        super().__init__()
+        for source in sources:
+            for library in source:
+                self.add(library)
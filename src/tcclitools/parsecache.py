@@ -0,0 +1,109 @@
+"""A persistent cache of the facts extracted from TwinCAT files"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+# Version of the format of the cached facts. Increment it when an extractor changes
+# the facts it returns, so the facts cached by earlier versions are discarded.
+FACTS_VERSION = 1
+
+
+class ParseCache:
+    """An on-disk (SQLite) cache of the facts extracted from parsed files.
+
+    Entries are keyed by the resolved path of the file and the kind of facts,
+    and are only valid for the modification time and size of the file they were
+    extracted from. The cache file can be shared by multiple threads and processes.
+    A cache file with facts of another `FACTS_VERSION` is cleared when it is opened."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version != FACTS_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS facts")
+            self._connection.execute(f"PRAGMA user_version = {FACTS_VERSION:d}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS facts ("
+            "path TEXT, kind TEXT, mtime INTEGER, size INTEGER, facts TEXT, "
+            "PRIMARY KEY (path, kind))"
+        )
+
+    def get_or_extract(
+        self,
+        path: Path,
+        kind: str,
+        extract: Callable[[Path], Any],
+        stat_result: os.stat_result | None = None,
+    ) -> Any:
+        """Return the cached facts of `kind` for a file. If they are missing or
+        outdated, extract them with `extract(path)` and store them in the cache.
+
+        The file is checked with a single `stat` call, or with its `stat_result`
+        if it is already known. Pass resolved paths (such as `UniquePath.filepath`):
+        other paths of the same file are cached separately."""
+        key = os.path.abspath(path)
+        stat = os.stat(key) if stat_result is None else stat_result
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime, size, facts FROM facts WHERE path = ? AND kind = ?",
+                (key, kind),
+            ).fetchone()
+        if row is not None and row[:2] == (stat.st_mtime_ns, stat.st_size):
+            return json.loads(row[2])
+
+        facts = extract(path)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?)",
+                (key, kind, stat.st_mtime_ns, stat.st_size, json.dumps(facts)),
+            )
+        return facts
+
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._connection.execute("DELETE FROM facts")
+
+    def close(self) -> None:
+        """Close the cache file"""
+        with self._lock:
+            self._connection.close()
+
+
+_parse_cache: ParseCache | None = None  # pylint:disable=invalid-name
+
+
+def set_parse_cache(cache: ParseCache | None) -> None:
+    """Set the parse cache used when loading TwinCAT files (None disables caching)"""
+    global _parse_cache  # pylint:disable=global-statement
+    _parse_cache = cache
+
+
+def get_parse_cache() -> ParseCache | None:
+    """Return the parse cache used when loading TwinCAT files"""
+    return _parse_cache
+
+
+def extract_facts(
+    path: Path,
+    kind: str,
+    extract: Callable[[Path], Any],
+    stat_result: os.stat_result | None = None,
+) -> Any:
+    """Extract facts of `kind` from a file with `extract(path)`,
+    using the parse cache (if set)"""
+    cache = _parse_cache
+    if cache is None:
+        return extract(path)
+    return cache.get_or_extract(path, kind, extract, stat_result)
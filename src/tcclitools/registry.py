@@ -0,0 +1,144 @@
+"""An identity map of the TwinCAT objects loaded in a session"""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .uniquepath import UniquePath
+
+T = TypeVar("T", bound=UniquePath)
+
+
+def _normalize(path: Path) -> Path:
+    """Return the absolute, case-normalized form of a path (without system calls)"""
+    return Path(os.path.normcase(os.path.abspath(path)))
+
+
+class Registry:
+    """An identity map of loaded TwinCAT objects, keyed by type and absolute path.
+
+    Every file is loaded (and parsed) only once: loading the same path again
+    returns the existing object, until it is invalidated. The identity map is
+    opt-in: it is only used after `set_registry(Registry())`."""
+
+    def __init__(self) -> None:
+        self._objects: dict[tuple[type, Path], Any] = {}
+        self._stats: dict[tuple[type, Path], tuple[int, int]] = {}
+        self._loading: dict[tuple[type, Path], threading.Lock] = {}
+        # The keys of the loaded objects, by object id
+        self._keys: dict[int, tuple[type, Path]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cls: type[T], path: Path, **kwargs: Any) -> T:
+        """Return the `cls` object of `path`, creating it with `cls(path, **kwargs)`
+        if it has not been loaded yet. An existing object without a parent adopts
+        the `parent` keyword argument (if any).
+
+        The key is the absolute path, which takes no system calls: a hit costs
+        no file system access at all."""
+        path = Path(os.path.abspath(path))
+        key = (cls, _normalize(path))
+        obj: Any = self._objects.get(key)
+        if obj is None:
+            with self._lock:
+                key_lock = self._loading.setdefault(key, threading.Lock())
+            # Different files are loaded concurrently, the same file only once
+            with key_lock:
+                obj = self._objects.get(key)
+                if obj is None:
+                    obj = cls(path, **kwargs)
+                    stat = getattr(obj, "_stat_result", None) or os.stat(key[1])
+                    with self._lock:
+                        self._objects[key] = obj
+                        self._keys[id(obj)] = key
+                        self._stats[key] = (stat.st_mtime_ns, stat.st_size)
+                        self._loading.pop(key, None)
+        parent = kwargs.get("parent")
+        if parent is not None and getattr(obj, "parent", parent) is None:
+            obj.parent = parent
+        return obj  # type:ignore
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Forget the objects of `path` (or all objects if no path is given),
+        so they are loaded again on next access. The objects that contain them
+        (such as the XAE project and solution of a PLC project) are also forgotten,
+        as they refer to the outdated objects. The objects they contain are kept,
+        and are adopted by the containers when these are loaded again."""
+        with self._lock:
+            if path is None:
+                keys = list(self._objects)
+            else:
+                normalized = _normalize(path)
+                keys = [key for key in self._objects if key[1] == normalized]
+            self._forget(keys)
+
+    def invalidate_modified(self) -> list[Path]:
+        """Forget the objects whose file (or folder) has been modified or removed
+        since it was loaded, and return their paths"""
+        modified = []
+        paths = []
+        with self._lock:
+            for (key, (mtime, size)) in self._stats.items():
+                try:
+                    stat = os.stat(key[1])
+                except FileNotFoundError:
+                    modified.append(key)
+                    continue
+                if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+                    modified.append(key)
+            paths = [self._objects[key].filepath for key in modified]
+            self._forget(modified)
+        return paths
+
+    def _forget(self, keys: list[tuple[type, Path]]) -> None:
+        """Remove objects and the objects that contain them, and detach the remaining
+        objects from removed containers, so they are adopted by the reloaded
+        containers (the lock must be held)"""
+        forgotten = set()
+        while keys:
+            key = keys.pop()
+            obj = self._objects.pop(key, None)
+            self._stats.pop(key, None)
+            if obj is None:
+                continue
+            del self._keys[id(obj)]
+            forgotten.add(id(obj))
+            parent = getattr(obj, "parent", None)
+            if id(parent) in self._keys:
+                keys.append(self._keys[id(parent)])
+        for obj in self._objects.values():
+            if id(getattr(obj, "parent", None)) in forgotten:
+                obj.parent = None
+
+    def __contains__(self, obj: object) -> bool:
+        key = self._keys.get(id(obj))
+        return key is not None and self._objects.get(key) is obj
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+
+# Disabled by default: objects share the objects they load only when it is set
+_registry: Registry | None = None  # pylint:disable=invalid-name
+
+
+def set_registry(registry: Registry | None) -> None:
+    """Set the registry of loaded TwinCAT objects (None disables the identity map)"""
+    global _registry  # pylint:disable=global-statement
+    _registry = registry
+
+
+def get_registry() -> Registry | None:
+    """Return the registry of loaded TwinCAT objects"""
+    return _registry
+
+
+def load(cls: type[T], path: Path, **kwargs: Any) -> T:
+    """Return the `cls` object of `path` from the registry (if set),
+    or create a new one"""
+    registry = _registry
+    if registry is None:
+        return cls(path, **kwargs)
+    return registry.get(cls, path, **kwargs)
@@ -0,0 +1,148 @@
+"""A persisted, incrementally refreshed index of a library repository"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+from .tclibraryreference import TcLibraryReference
+from .tcrepolibrary import REPOSITORY_PATH, TcRepoLibrary
+
+# Libraries are stored in company/title/version folders
+_LIBRARY_DEPTH = 3
+
+
+class RepositoryIndex:
+    """An index of the libraries in a library repository, persisted in `path`.
+
+    The index stores the company, title, version, folder and modification time
+    of every library. A refresh only lists the folders whose modification time
+    has changed, and only parses the `browsercache` files that have changed."""
+
+    def __init__(self, path: Path, tc_path: Path = REPOSITORY_PATH) -> None:
+        """Load the index of the repository in `tc_path` from `path`
+        (if it exists). Call `refresh()` to bring it up to date."""
+        self.path = path
+        self.tc_path = tc_path
+        self._lock = threading.Lock()
+        self._directories: dict[str, dict[str, Any]] = {}
+        self._libraries: dict[str, dict[str, Any]] = {}
+        self._references: dict[Path, TcLibraryReference] | None = None
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}  # Rebuild a corrupt index
+            if data.get("root") == str(tc_path):
+                self._directories = data["directories"]
+                self._libraries = data["libraries"]
+
+    def refresh(self) -> bool:
+        """Update the index with the changes in the repository, and save it
+        if anything has changed. Return True if anything has changed."""
+        if not self.tc_path.exists():
+            raise FileNotFoundError(f"Path '{self.tc_path}' does not exist!")
+        with self._lock:
+            directories: dict[str, dict[str, Any]] = {}
+            libraries: dict[str, dict[str, Any]] = {}
+            changed = False
+            stack = [("", 0)]
+            while stack:
+                (relative, depth) = stack.pop()
+                path = self.tc_path / relative
+                if depth == _LIBRARY_DEPTH:
+                    library = self._refresh_library(relative)
+                    if library is not None:
+                        changed = changed or library is not self._libraries.get(
+                            relative
+                        )
+                        libraries[relative] = library
+                    continue
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                directory = self._directories.get(relative)
+                if directory is None or directory["mtime"] != mtime:
+                    with os.scandir(path) as entries:
+                        children = sorted(
+                            entry.name for entry in entries if entry.is_dir()
+                        )
+                    directory = {"mtime": mtime, "children": children}
+                    changed = True
+                directories[relative] = directory
+                for child in directory["children"]:
+                    stack.append(
+                        (f"{relative}/{child}" if relative else child, depth + 1)
+                    )
+
+            changed = changed or libraries.keys() != self._libraries.keys()
+            self._directories = directories
+            self._libraries = libraries
+            if changed:
+                self._references = None
+                self.save()
+            return changed
+
+    def _refresh_library(self, relative: str) -> dict[str, Any] | None:
+        """Return the (updated) entry of a library folder,
+        or None if it does not contain a library"""
+        path = self.tc_path / relative
+        try:
+            mtime = os.stat(path / "browsercache").st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        library = self._libraries.get(relative)
+        if library is None or library["mtime"] != mtime:
+            repo_library = TcRepoLibrary(path)
+            library = {
+                "company": repo_library.company,
+                "title": repo_library.title,
+                "version": str(repo_library.version),
+                "mtime": mtime,
+            }
+        return library
+
+    def save(self) -> None:
+        """Write the index to disk"""
+        data = {
+            "root": str(self.tc_path),
+            "directories": self._directories,
+            "libraries": self._libraries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+    @property
+    def libraries(self) -> dict[Path, TcLibraryReference]:
+        """The libraries in the repository, by folder"""
+        references = self._references
+        if references is None:
+            references = {
+                self.tc_path
+                / relative: TcLibraryReference(
+                    library["title"], library["version"], library["company"]
+                )
+                for (relative, library) in sorted(self._libraries.items())
+            }
+            self._references = references
+        return references
+
+    def __iter__(self) -> Iterator[TcLibraryReference]:
+        return iter(list(self.libraries.values()))
+
+    def __len__(self) -> int:
+        return len(self._libraries)
+
+
+def load_repository_index(
+    path: Path, tc_path: Path = REPOSITORY_PATH
+) -> RepositoryIndex:
+    """Load the persisted index of a library repository, and refresh it"""
+    index = RepositoryIndex(path, tc_path)
+    index.refresh()
+    return index
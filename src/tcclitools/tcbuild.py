@@ -1,25 +1,74 @@
 """Wrapper for the TcBuild tool"""
+import json
+import os
+import shutil
+import signal
 import subprocess  # nosec
+import sys
+import threading
+from collections import deque
 from pathlib import Path
+from typing import IO, Any, Callable
 
 from packaging.version import InvalidVersion, Version
 
-from .exceptions import TcBuildInvokeError
+from .exceptions import BuildAbortedError, TcBuildInvokeError
+from .repositoryindex import RepositoryIndex
 
 VERSION_MINIMAL = Version("1.0.1.0")
+EXECUTABLE = "tcbuild.exe"
+# Number of output lines kept for the failure reason when streaming the output
+TAIL_LINES = 100
 
+# Callback for every line of streamed output: on_line(stream, line),
+# where stream is either "stdout" or "stderr"
+LineCallback = Callable[[str, str], None]
+
+# Results of the availability probe, by (resolved executable path, mtime)
+_probe_results: dict[tuple[str, int], tuple[bool, str]] = {}
+_probe_lock = threading.Lock()
+_probe_cache_file: Path | None = None  # pylint:disable=invalid-name
+
+
+def merge_output(stdout: str, stderr: str) -> str:
+    """Merge the output streams of TcBuild into its console output"""
+    # Prefer contents of stderr stream over stdout
+    output = stderr if stderr else stdout
+    return output.strip()
+
+
+def build_args(path: Path) -> list[str]:
+    """Return the TcBuild arguments to build a solution"""
+    return ["build", str(path.resolve())]
+
+
+def install_args(
+    path: Path, xaeproject: str, plcproject: str, libraryfile: str | None = None
+) -> list[str]:
+    """Return the TcBuild arguments to install a library"""
+    cmds = [
+        "install",
+        str(path.resolve()),
+        "--xaeproject",
+        xaeproject,
+        "--plcproject",
+        plcproject,
+    ]
+    if libraryfile:
+        cmds.extend(["--libraryfile", libraryfile])
+    return cmds
 
-def run(args: list[str]) -> tuple[int, str]:
-    """Run TcBuild with the given arguments, and return the exit code and console output"""
 
-    def merge_output(stdout: str, stderr: str) -> str:
-        # Prefer contents of stderr stream over stdout
-        output = stderr if stderr else stdout
-        return output.strip()
+def failure_reason(returncode: int, output: str) -> str:
+    """Return the reason why a TcBuild invocation failed"""
+    return f"TcBuild exited with code {returncode}. Details:\n{output}"
 
+
+def run(args: list[str]) -> tuple[int, str]:
+    """Run TcBuild with the given arguments, and return the exit code and console output"""
     try:
         proc = subprocess.run(  # nosec
-            ["tcbuild.exe"] + args,
+            [EXECUTABLE] + args,
             check=True,
             capture_output=True,
             encoding="utf-8",
@@ -32,66 +81,226 @@ def run(args: list[str]) -> tuple[int, str]:
     return (proc.returncode, merge_output(proc.stdout, proc.stderr))
 
 
-def is_available(raise_if_unavailable: bool = False) -> tuple[bool, str]:
-    """Check if TcBuild is available. If not, return `False` and the reason why,\\
-    or raise an exception when `raise_if_unavailable` is `True`."""
-    version: Version | None = None
+def process_group_kwargs() -> dict[str, Any]:
+    """Return the extra arguments to start TcBuild in its own process group,
+    so it can be killed together with its child processes (see `kill_process_tree`)"""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_process_tree(pid: int) -> None:
+    """Kill a TcBuild process (started with `process_group_kwargs()`)
+    and all of its child processes"""
+    if sys.platform == "win32":
+        subprocess.run(  # nosec
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    else:
+        # The process was started in a new session, so it leads its own process group
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
 
-    def raise_or_return(msg: str) -> tuple[bool, str]:
-        if raise_if_unavailable:
-            raise TcBuildInvokeError(msg)
-        return (False, msg)
+
+def run_streaming(
+    args: list[str],
+    on_line: LineCallback | None = None,
+    log_file: Path | None = None,
+    tail_lines: int = TAIL_LINES,
+) -> tuple[int, str]:
+    """Run TcBuild with the given arguments, and return the exit code and the last
+    `tail_lines` lines of its console output (of both output streams).
+
+    Every output line is passed to `on_line` and appended to `log_file`
+    as soon as it arrives, so the memory use does not grow with the output.
+    An exception raised by `on_line` kills TcBuild (including its child processes)
+    and is raised again when its output has been read (e.g., to abort a build on
+    its first error)."""
+    tail: deque[str] = deque(maxlen=tail_lines)
+    lock = threading.Lock()
+    log = log_file.open("a", encoding="utf-8") if log_file is not None else None
+    failures: list[Exception] = []
+
+    def read(
+        stream_name: str, stream: IO[str] | None, proc: subprocess.Popen[str]
+    ) -> None:
+        for line in stream or []:
+            line = line.rstrip("\r\n")
+            with lock:
+                tail.append(line)
+                if log is not None:
+                    log.write(line + "\n")
+                if on_line is not None and not failures:
+                    try:
+                        on_line(stream_name, line)
+                    except Exception as exc:  # pylint:disable=broad-except
+                        failures.append(exc)
+                        kill_process_tree(proc.pid)
 
+    try:
+        with subprocess.Popen(  # nosec
+            [EXECUTABLE] + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+            **process_group_kwargs(),
+        ) as proc:
+            try:
+                stderr_reader = threading.Thread(
+                    target=read, args=("stderr", proc.stderr, proc), daemon=True
+                )
+                stderr_reader.start()
+                read("stdout", proc.stdout, proc)
+                stderr_reader.join()
+            except BaseException:
+                # TcBuild does not receive the interrupts of its own process group
+                kill_process_tree(proc.pid)
+                raise
+            returncode = proc.wait()
+    finally:
+        if log is not None:
+            log.close()
+    if failures:
+        raise failures[0]
+    return (returncode, "\n".join(tail).strip())
+
+
+def set_probe_cache_file(path: Path | None) -> None:
+    """Persist the results of the availability probe in `path`,
+    so they are reused across runs (None only keeps them in memory)"""
+    global _probe_cache_file  # pylint:disable=global-statement
+    with _probe_lock:
+        _probe_cache_file = path
+        if path is not None and path.exists():
+            for (executable, mtime, available, reason) in json.loads(
+                path.read_text(encoding="utf-8")
+            ):
+                _probe_results.setdefault((executable, mtime), (available, reason))
+
+
+def refresh_probe() -> None:
+    """Forget the results of the availability probe (including persisted results),
+    so the next `is_available()` call checks TcBuild again"""
+    with _probe_lock:
+        _probe_results.clear()
+        if _probe_cache_file is not None:
+            _probe_cache_file.unlink(missing_ok=True)
+
+
+def _save_probe_results() -> None:
+    """Write the results of the availability probe to the cache file (if set)"""
+    if _probe_cache_file is None:
+        return
+    _probe_cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Replace the file at once, so concurrent runs never read a partial file
+    temp_path = _probe_cache_file.with_name(
+        f"{_probe_cache_file.name}.{os.getpid()}.tmp"
+    )
+    temp_path.write_text(
+        json.dumps([[*key, *result] for (key, result) in _probe_results.items()]),
+        encoding="utf-8",
+    )
+    os.replace(temp_path, _probe_cache_file)
+
+
+def _probe() -> tuple[bool, str]:
+    """Check if TcBuild can be invoked and is recent enough"""
     try:
         (returncode, output) = run(["--version"])
     except (subprocess.CalledProcessError, FileNotFoundError):
-        return raise_or_return("TcBuild not installed or not available on PATH")
+        return (False, "TcBuild not installed or not available on PATH")
 
     if returncode != 0:
-        return raise_or_return(
-            f'TcBuild exited with returncode {returncode}: "{output}"'
-        )
+        return (False, f'TcBuild exited with returncode {returncode}: "{output}"')
 
     try:
         version = Version(output)
     except InvalidVersion:
-        return raise_or_return(
-            f'TcBuild returned unexpected version string: "{output}"'
-        )
+        return (False, f'TcBuild returned unexpected version string: "{output}"')
 
     if version < VERSION_MINIMAL:
-        return raise_or_return(
+        return (
+            False,
             f"TcBuild version is outdated (got: {version}, expected: {VERSION_MINIMAL})",
         )
 
     return (True, "")
 
 
-def build(path: Path) -> tuple[bool, str]:
-    """Build the solution. If it fails, return False and the reason why."""
+def is_available(raise_if_unavailable: bool = False) -> tuple[bool, str]:
+    """Check if TcBuild is available. If not, return `False` and the reason why,\\
+    or raise an exception when `raise_if_unavailable` is `True`.
+
+    The result is cached for the executable on PATH (until it is modified),
+    so TcBuild is only launched once per executable."""
+    executable = shutil.which(EXECUTABLE)
+    key = None
+    if executable is not None:
+        executable = os.path.realpath(executable)
+        key = (executable, os.stat(executable).st_mtime_ns)
+    result = _probe_results.get(key) if key is not None else None
+    if result is None:
+        result = _probe()
+        if key is not None:
+            with _probe_lock:
+                _probe_results[key] = result
+                _save_probe_results()
+
+    if not result[0] and raise_if_unavailable:
+        raise TcBuildInvokeError(result[1])
+    return result
+
+
+def build(
+    path: Path, on_line: LineCallback | None = None, log_file: Path | None = None
+) -> tuple[bool, str]:
+    """Build the solution. If it fails, return False and the reason why.
+    When `on_line` or `log_file` is given, the output is streamed (see `run_streaming`),
+    and `on_line` can abort the build by raising BuildAbortedError."""
     is_available(raise_if_unavailable=True)
-    (returncode, output) = run(["build", str(path.resolve())])
+    args = build_args(path)
+    try:
+        if on_line is not None or log_file is not None:
+            (returncode, output) = run_streaming(args, on_line, log_file)
+        else:
+            (returncode, output) = run(args)
+    except BuildAbortedError as exc:
+        return (False, str(exc))
     if returncode == 0:
         return (True, "")
-    return (False, f"TcBuild exited with code {returncode}. Details:\n{output}")
+    return (False, failure_reason(returncode, output))
 
 
-def install(
-    path: Path, xaeproject: str, plcproject: str, libraryfile: str | None = None
+def install(  # pylint:disable=too-many-arguments
+    path: Path,
+    xaeproject: str,
+    plcproject: str,
+    libraryfile: str | None = None,
+    repository_index: RepositoryIndex | None = None,
+    on_line: LineCallback | None = None,
+    log_file: Path | None = None,
 ) -> tuple[bool, str]:
-    """Install a library. If it fails, return False and the reason why."""
+    """Install a library. If it fails, return False and the reason why.
+    After a successful installation, the `repository_index` (if any) is refreshed.
+    When `on_line` or `log_file` is given, the output is streamed (see `run_streaming`),
+    and `on_line` can abort the installation by raising BuildAbortedError."""
     is_available(raise_if_unavailable=True)
-    cmds = [
-        "install",
-        str(path.resolve()),
-        "--xaeproject",
-        xaeproject,
-        "--plcproject",
-        plcproject,
-    ]
-    if libraryfile:
-        cmds.extend(["--libraryfile", libraryfile])
-    (returncode, output) = run(cmds)
+    args = install_args(path, xaeproject, plcproject, libraryfile)
+    try:
+        if on_line is not None or log_file is not None:
+            (returncode, output) = run_streaming(args, on_line, log_file)
+        else:
+            (returncode, output) = run(args)
+    except BuildAbortedError as exc:
+        return (False, str(exc))
     if returncode == 0:
+        if repository_index is not None:
+            repository_index.refresh()
         return (True, "")
-    return (False, f"TcBuild exited with code {returncode}. Details:\n{output}")
+    return (False, failure_reason(returncode, output))
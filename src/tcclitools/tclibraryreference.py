@@ -2,25 +2,107 @@
 from __future__ import annotations
 
 import re
+import weakref
+from functools import lru_cache
 
-from packaging.version import Version, parse
+from packaging.version import InvalidVersion, Version
+
+
+@lru_cache(maxsize=65536)
+def parse_version(version: str) -> tuple[tuple[int, ...], str]:
+    """Return the sort key and the normalized string of a library version.
+
+    The key holds the numeric parts of the version without trailing zeros,
+    so versions compare like `Version` objects ("1.0" == "1.0.0.0").
+    TwinCAT library versions are purely numeric: other versions (such as pre-,
+    post- and dev-releases) raise InvalidVersion, a ValueError."""
+    parts = version.strip().split(".")
+    if not all(part.isascii() and part.isdigit() for part in parts):
+        raise InvalidVersion(f"Invalid library version: '{version}'")
+    numbers = [int(part) for part in parts]
+    normalized = ".".join(str(number) for number in numbers)
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    return (tuple(numbers), normalized)
+
+
+@lru_cache(maxsize=4096)
+def _to_version(version: str) -> Version:
+    """Return the (shared) Version object of a normalized version string"""
+    return Version(version)
 
 
 class TcLibraryReference:
-    """A TwinCAT library reference"""
+    """A TwinCAT library reference.
+
+    References are immutable: the normalized (title, company) key and the hash
+    are computed once. References are equal when their keys are equal and their
+    versions match (any version matches all versions). The hash includes the
+    version, so sets and dictionaries keep an any-version reference next to the
+    references to specific versions of the same library."""
+
+    __slots__ = (
+        "_title",
+        "_company",
+        "_version",
+        "_version_key",
+        "_key",
+        "_hash",
+        "__weakref__",
+    )
 
     _RE_LIBRARY_REF = re.compile(r"^(.*), (.*) \((.*)\)")
 
     def __init__(self, title: str, version: str | Version, company: str) -> None:
-        self.title: str = title
-        self.version: str | Version = (
-            version if version == "*" else Version(str(version))
-        )
-        self.company: str = company
+        self._title = title
+        self._company = company
+        self._version: str = str(version)
+        self._version_key: tuple[int, ...] = ()
+        if self._version != "*":
+            (self._version_key, self._version) = parse_version(self._version)
+        self._key = (title.lower(), company.lower())
+        self._hash = hash((self._key, self._version_key))
+
+    @property
+    def title(self) -> str:
+        """The title of the library"""
+        return self._title
+
+    @property
+    def company(self) -> str:
+        """The company of the library"""
+        return self._company
+
+    @property
+    def version(self) -> str | Version:
+        """The version of the library (`"*"` for any version).
+        The `Version` object is only created when it is accessed."""
+        if not self._version_key:
+            return self._version
+        return _to_version(self._version)
+
+    @property
+    def version_key(self) -> tuple[int, ...]:
+        """A sortable key of the version (an empty tuple for any version)"""
+        return self._version_key
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """The normalized (lowercase) title and company of the library"""
+        return self._key
 
     def is_any_version(self) -> bool:
         """Return True if version is any (e.g., "*")"""
-        return isinstance(self.version, str) and self.version == "*"
+        return not self._version_key
+
+    @staticmethod
+    def _split_string(full_name: str) -> tuple[str, str, str]:
+        """Retrieve title, version string and company from a string
+        that matches the Beckhoff format"""
+        res = TcLibraryReference._RE_LIBRARY_REF.match(full_name)
+        if res is None:
+            raise ValueError(f'Invalid library string: "{full_name}"')
+        return (res.group(1), res.group(2), res.group(3))
 
     @staticmethod
     def parse_string(
@@ -31,13 +113,10 @@ class TcLibraryReference:
         (e.g, `"Tc2_Standard, 3.3.3.0 (Beckhoff Automation GmbH)"`)
         """
         try:
-            res = TcLibraryReference._RE_LIBRARY_REF.match(full_name)
-            title = res.group(1)  # type:ignore
-            version = res.group(2)  # type:ignore
-            company = res.group(3)  # type:ignore
-            return (  # type:ignore
+            (title, version, company) = TcLibraryReference._split_string(full_name)
+            return (
                 title,
-                version if version == "*" else parse(version),
+                version if version == "*" else _to_version(parse_version(version)[1]),
                 company,
             )
         except Exception as exc:
@@ -47,9 +126,24 @@ class TcLibraryReference:
     def from_string(full_name: str) -> TcLibraryReference:
         """Create a TcLibraryReference instance from a string
         that matches the Beckhoff format
-        (e.g, `"Tc2_Standard, 3.3.3.0 (Beckhoff Automation GmbH)"`)
+        (e.g, `"Tc2_Standard, 3.3.3.0 (Beckhoff Automation GmbH)"`).
+        Identical strings share a single (interned) instance.
         """
-        return TcLibraryReference(*TcLibraryReference.parse_string(full_name))
+        reference = _interned.get(full_name)
+        if reference is None:
+            try:
+                parts = TcLibraryReference._split_string(full_name)
+                reference = TcLibraryReference(*parts)
+            except Exception as exc:
+                raise ValueError(f'Invalid library string: "{full_name}"') from exc
+            reference = _interned.setdefault(full_name, reference)
+        return reference
+
+    @staticmethod
+    def intern(reference: TcLibraryReference) -> TcLibraryReference:
+        """Return the shared instance of a library reference
+        (`reference` itself if there is no shared instance yet)"""
+        return _interned.setdefault(str(reference), reference)
 
     @staticmethod
     def select_latest(
@@ -75,46 +169,42 @@ class TcLibraryReference:
                 "Library references do not have matching title and company"
             )
 
-        return sorted(references, key=lambda x: x.version)[-1]
+        return max(references, key=lambda x: x.version_key)
 
     def __str__(self) -> str:
         """Custom __str__ implementation
         that matches the Beckhoff format
         (e.g, `"Tc2_Standard, 3.3.3.0 (Beckhoff Automation GmbH)"`)
         """
-        return f"{self.title}, {self.version} ({self.company})"
+        return f"{self.title}, {self._version} ({self.company})"
 
     def __repr__(self) -> str:
-        return f'{self.__class__.__name__}("{self.title}", "{self.version}", "{self.company}")'
+        return f'{self.__class__.__name__}("{self.title}", "{self._version}", "{self.company}")'
 
     def _equal_title_and_company(self, other: TcLibraryReference) -> bool:
-        return (
-            self.title.lower() == other.title.lower()
-            and self.company.lower() == other.company.lower()
-        )
+        return self._key == other.key
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, TcLibraryReference):
             return NotImplemented
         return self._equal_title_and_company(other) and (
-            (
-                (self.version == other.version)
-                or self.is_any_version()
-                or other.is_any_version()
-            )
+            self._version_key == other._version_key
+            or not self._version_key
+            or not other._version_key
         )
 
     def __gt__(self, other: object) -> bool:
         if not isinstance(other, TcLibraryReference):
             return NotImplemented
-        if isinstance(other.version, str):
+        if other.is_any_version():
             raise NotImplementedError(
                 f"Cannot compare versions of {self} and"
                 "{other}: version {other.version} not allowed"
             )
         return self._equal_title_and_company(other) and (
-            self.is_any_version()
-            or (isinstance(self.version, Version) and (self.version > other.version))
+            self.is_any_version() or self._version_key > other._version_key
         )
 
     def __ge__(self, other: object) -> bool:
@@ -123,4 +213,9 @@ class TcLibraryReference:
         return self.__gt__(other) or self.__eq__(other)
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
+
+
+_interned: weakref.WeakValueDictionary[
+    str, TcLibraryReference
+] = weakref.WeakValueDictionary()
@@ -1,55 +1,122 @@
 """A TwinCAT PLC Project"""
 from __future__ import annotations
 
-from pathlib import Path
+import os
+import threading
+from pathlib import Path, PureWindowsPath
 from typing import Any, Iterable
 
 from defusedxml import ElementTree
-from packaging.version import InvalidVersion, parse
+from packaging.version import InvalidVersion
 
+from .parsecache import extract_facts
 from .tclibraryreference import TcLibraryReference
 from .tctreeitem import TcTreeItem
 from .uniquepath import UniquePath
 
+_PROPERTIES = ["Title", "ProjectVersion", "Company"]
+
 
 class TcPlcProject(UniquePath, TcTreeItem):  # pylint:disable=too-few-public-methods
     """A TwinCAT PLC Project"""
 
     def __init__(
-        self, path: Path, parent: Any = None, children: Iterable[Any] | None = None
+        self,
+        path: Path,
+        parent: Any = None,
+        children: Iterable[Any] | None = None,
+        stat_result: os.stat_result | None = None,
     ):
         self._allowed_types = [".plcproj"]
-        UniquePath.__init__(self, path)
+        UniquePath.__init__(self, path, stat_result)
         TcTreeItem.__init__(self, parent=parent, children=children)
-        self.xmlroot = ElementTree.parse(path).getroot()
+        self._xmlroot: Any = None
+        self._facts: dict[str, Any] = extract_facts(
+            self.filepath, "plcproj", self._extract_facts, self._stat_result
+        )
         self._library_references: set[TcLibraryReference] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _extract_facts(path: Path) -> dict[str, Any]:
+        """Extract the properties, library references and source files
+        from a PLC project file, in a single streaming pass.
+        Elements are freed as soon as they have been processed."""
+        properties: dict[str, str | None] = {}
+        references: list[str] = []
+        sources: list[str] = []
+        tags: list[str] = []
+        root = None
+        for (event, element) in ElementTree.iterparse(path, events=("start", "end")):
+            if event == "start":
+                tags.append(element.tag.rsplit("}", 1)[-1])
+                if root is None:
+                    root = element
+                continue
+            (tag, parent) = (tags[-1], tags[-2] if len(tags) > 1 else None)
+            if len(tags) == 3:
+                if parent == "PropertyGroup" and tag in _PROPERTIES:
+                    properties.setdefault(tag, element.text)
+                elif (
+                    parent == "ItemGroup"
+                    and tag in ("Compile", "None")
+                    and "Include" in element.attrib
+                ):
+                    sources.append(element.attrib["Include"])
+            if tag == "DefaultResolution" and parent == "PlaceholderReference":
+                references.append(element.text)
+            tags.pop()
+            if len(tags) == 1:
+                root.clear()  # type:ignore
+            else:
+                element.clear()
+        return {
+            "properties": [properties.get(name) for name in _PROPERTIES],
+            "references": references,
+            "sources": sources,
+        }
+
+    @property
+    def xmlroot(self) -> Any:
+        """The root element of the PLC project file.
+
+        The full XML tree is only needed for custom queries, so it is not kept
+        in memory until it is accessed for the first time."""
+        if self._xmlroot is None:
+            self._xmlroot = ElementTree.parse(self.filepath).getroot()
+        return self._xmlroot
 
     @property
     def library_references(self) -> Iterable[TcLibraryReference]:
         """Libraries referenced by the PLC project"""
         if self._library_references is None:
-            self._library_references = {
-                TcLibraryReference.from_string(
-                    placeholder.find("{*}DefaultResolution").text
-                )
-                for placeholder in self.xmlroot.findall(".//{*}PlaceholderReference")
-            }
+            with self._lock:
+                if self._library_references is None:
+                    self._library_references = {
+                        TcLibraryReference.from_string(reference)
+                        for reference in self._facts["references"]
+                    }
         return iter(self._library_references)
 
+    @property
+    def source_files(self) -> list[Path]:
+        """Source files (`Compile` and `None` items) of the PLC project"""
+        return [
+            self.filepath.parent.joinpath(*PureWindowsPath(source).parts)
+            for source in self._facts["sources"]
+        ]
+
     def as_reference(self) -> TcLibraryReference | None:
         """Return a TcLibraryReference object if the PLC project
         can be installed as a library, else return None"""
+        (title, version, company) = self._facts["properties"]
+        if title is None or version is None or company is None:
+            return None
         try:
-            (title, version, company) = [
-                self.xmlroot.find("./{*}PropertyGroup/{*}" + find_str).text
-                for find_str in ["Title", "ProjectVersion", "Company"]
-            ]
-            version = parse(version)
-        except (AttributeError, InvalidVersion):
+            return TcLibraryReference(
+                title=title,
+                version=version,
+                company=company,
+            )
+        except InvalidVersion:
             return None
-
-        return TcLibraryReference(
-            title=title,
-            version=version,
-            company=company,
-        )
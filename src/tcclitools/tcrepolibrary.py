@@ -1,36 +1,55 @@
 """A TwinCAT library in the library repository"""
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Iterable
 
 from defusedxml import ElementTree
 
 from .exceptions import InvalidLibraryError
-from .tclibraryreference import TcLibraryReference
+from .filewalker import walk
+from .parsecache import extract_facts
+from .registry import load
+from .tclibraryreference import TcLibraryReference, parse_version
 from .uniquepath import UniquePath
 
+REPOSITORY_PATH = Path("C:\\TwinCAT\\3.1\\Components\\Plc\\Managed Libraries")
 
-class TcRepoLibrary(TcLibraryReference, UniquePath):
-    """A TwinCAT library in the library repository"""
 
-    def __init__(self, path: Path) -> None:
-        """Initialize a TcRepoLibrary from a folder in the Library Repository.
-        The specified folder must contain a `browsercache.` file which contains the
-        library properties (name, version and company)."""
+def read_full_name(file: IO[bytes]) -> str:
+    """Read the full library name from browsercache contents.
+    Only the start of the file is parsed: the name is an attribute
+    of the root element, the rest of the (large) file is not needed."""
+    for (_, element) in ElementTree.iterparse(file, events=("start",)):
+        return str(element.attrib["Name"])
+    raise ValueError("Missing root element")
 
-        self._allowed_types = [None]
-        UniquePath.__init__(self, path)
 
-        path_browsercache = path / "browsercache"
-        if not path_browsercache.exists():
-            raise FileNotFoundError(f"Missing browsercache file in directory '{path}'")
+class MetadataLibrary(TcLibraryReference, UniquePath):
+    """A base class for TwinCAT libraries whose properties (name, version and company)
+    are read from a metadata file"""
+
+    # Kind of the facts in the parse cache
+    _metadata_kind = "metadata"
+
+    def __init__(self, path: Path, stat_result: os.stat_result | None = None) -> None:
+        UniquePath.__init__(self, path, stat_result)
+
+        (metadata_path, metadata_stat) = self._metadata_file()
         try:
-            full_name = ElementTree.parse(path_browsercache).getroot().attrib["Name"]
-            (title, version, company) = self.parse_string(full_name)
+            full_name = extract_facts(
+                metadata_path,
+                self._metadata_kind,
+                self._extract_full_name,
+                metadata_stat,
+            )
+            (title, version, company) = self._split_string(full_name)
+            if version != "*":
+                parse_version(version)
         except Exception as exc:
             raise InvalidLibraryError(
-                f'Invalid browsercache file: "{path_browsercache}"'
+                f'Invalid library metadata: "{metadata_path}"'
             ) from exc
 
         TcLibraryReference.__init__(
@@ -40,21 +59,55 @@ class TcRepoLibrary(TcLibraryReference, UniquePath):
             company=company,
         )
 
+    def _metadata_file(self) -> tuple[Path, os.stat_result]:
+        """Return the path and the stat result of the metadata file"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _extract_full_name(path: Path) -> str:
+        """Extract the full library name from a metadata file"""
+        raise NotImplementedError
+
     def as_reference(self) -> TcLibraryReference:
         """Return a TcLibraryReference object"""
-        return TcLibraryReference(self.title, self.version, self.company)
+        return TcLibraryReference(self.title, self._version, self.company)
 
     def __hash__(self) -> int:  # pylint:disable=useless-parent-delegation
         # https://stackoverflow.com/questions/53518981/inheritance-hash-sets-to-none-in-a-subclass
         return super().__hash__()
 
 
+class TcRepoLibrary(MetadataLibrary):
+    """A TwinCAT library in the library repository, initialized from a folder in the
+    Library Repository. The specified folder must contain a `browsercache.` file which
+    contains the library properties (name, version and company)."""
+
+    _allowed_types = [None]
+    _metadata_kind = "browsercache"
+
+    def _metadata_file(self) -> tuple[Path, os.stat_result]:
+        path_browsercache = self.filepath / "browsercache"
+        try:
+            return (path_browsercache, os.stat(path_browsercache))
+        except (FileNotFoundError, NotADirectoryError) as exc:
+            raise FileNotFoundError(
+                f"Missing browsercache file in directory '{self.filepath}'"
+            ) from exc
+
+    @staticmethod
+    def _extract_full_name(path: Path) -> str:
+        """Extract the full library name from a browsercache file"""
+        with path.open("rb") as file:
+            return read_full_name(file)
+
+
 def get_library_repository(
-    tc_path: Path = Path("C:\\TwinCAT\\3.1\\Components\\Plc\\Managed Libraries"),
+    tc_path: Path = REPOSITORY_PATH,
 ) -> Iterable[TcRepoLibrary]:
     """Return libraries from a library repository.
     Defaults to the `C:\\TwinCAT\\3.1\\Components\\Plc\\Managed Libraries` folder."""
     if not tc_path.exists():
         raise FileNotFoundError(f"Path '{tc_path}' does not exist!")
-    for path in tc_path.glob("**/browsercache"):
-        yield TcRepoLibrary(path.parent)
+    # The repository layout is always company/title/version/browsercache
+    for entry in walk(tc_path, "browsercache", max_depth=3):
+        yield load(TcRepoLibrary, Path(entry.path).parent)
@@ -1,10 +1,14 @@
 """A TcXaeShell solution"""
 from __future__ import annotations
 
+import os
 import re
+import threading
 from pathlib import Path
 from typing import Any, Iterable
 
+from .parsecache import extract_facts
+from .registry import load
 from .tclibraryreference import TcLibraryReference
 from .tcplcproject import TcPlcProject
 from .tctreeitem import TcTreeItem
@@ -17,38 +21,62 @@ class TcSolution(UniquePath, TcTreeItem):
 
     _REGEX_PROJECT_FILE = re.compile(r'Project\("\{.*?\}"\).*?,\s"(.+tsp{1,2}roj)"')
 
-    def __init__(self, path: Path, children: Iterable[Any] | None = None):
+    def __init__(
+        self,
+        path: Path,
+        children: Iterable[Any] | None = None,
+        stat_result: os.stat_result | None = None,
+    ):
         self._allowed_types = [".sln"]
-        UniquePath.__init__(self, path)
+        UniquePath.__init__(self, path, stat_result)
         TcTreeItem.__init__(self, parent=None, children=children)
         self._xae_projects: set[TcXaeProject] | None = None
         self._plc_projects: set[TcPlcProject] | None = None
         self._library_references: set[TcLibraryReference] | None = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def _extract_project_paths(cls, path: Path) -> list[str]:
+        """Extract the (relative) paths of the XAE projects from a solution file"""
+        project_paths = []
+        with path.open("r", encoding="utf-8") as file:
+            for line in file.readlines():
+                match = cls._REGEX_PROJECT_FILE.match(line)
+                if match:
+                    project_paths.append(match.group(1))
+        return project_paths
 
     @property
     def xae_projects(self) -> Iterable[TcXaeProject]:
         """XAE projects in the solution"""
         if self._xae_projects is None:
-            projects = []
-            with self.filepath.open("r", encoding="utf-8") as file:
-                for line in file.readlines():
-                    match = self._REGEX_PROJECT_FILE.match(line)
-                    if match:
-                        projects.append(
-                            TcXaeProject(
-                                self.filepath.parent / match.group(1), parent=self
-                            )
+            with self._lock:
+                if self._xae_projects is None:
+                    projects = [
+                        load(
+                            TcXaeProject,
+                            self.filepath.parent / project_path,
+                            parent=self,
+                        )
+                        for project_path in extract_facts(
+                            self.filepath,
+                            "sln",
+                            self._extract_project_paths,
+                            self._stat_result,
                         )
-            self._xae_projects = set(projects)
+                    ]
+                    self._xae_projects = set(projects)
         return iter(self._xae_projects)
 
     @property
     def plc_projects(self) -> Iterable[TcPlcProject]:
         """PLC projects in the solution"""
         if self._plc_projects is None:
-            self._plc_projects = {
-                plc_project
-                for xae_project in self.xae_projects
-                for plc_project in xae_project.plc_projects
-            }
+            with self._lock:
+                if self._plc_projects is None:
+                    self._plc_projects = {
+                        plc_project
+                        for xae_project in self.xae_projects
+                        for plc_project in xae_project.plc_projects
+                    }
         return iter(self._plc_projects)
@@ -1,52 +1,129 @@
 """A TwinCAT XAE Project"""
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
 from typing import Any, Iterable
 
 from defusedxml import ElementTree
 
+from .parsecache import extract_facts
+from .registry import load
 from .tcplcproject import TcPlcProject
 from .tctreeitem import TcTreeItem
 from .uniquepath import UniquePath
 
 
+def _local_name(tag: str) -> str:
+    """Return the tag of an XML element without its namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+
 class TcXaeProject(UniquePath, TcTreeItem):  # pylint:disable=too-few-public-methods
     """A TwinCAT XAE Project"""
 
     def __init__(
-        self, path: Path, parent: Any = None, children: Iterable[Any] | None = None
+        self,
+        path: Path,
+        parent: Any = None,
+        children: Iterable[Any] | None = None,
+        stat_result: os.stat_result | None = None,
     ):
         self._allowed_types = [".tsproj", ".tspproj"]
-        UniquePath.__init__(self, path)
+        UniquePath.__init__(self, path, stat_result)
         TcTreeItem.__init__(self, parent=parent, children=children)
-        self.xmlroot = ElementTree.parse(path).getroot()
+        self._xmlroot: Any = None
+        self._projects: list[list[str]] = extract_facts(
+            self.filepath, "tsproj", self._extract_projects, self._stat_result
+        )
         self._plc_projects: set[TcPlcProject] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _extract_projects(path: Path) -> list[list[str]]:
+        """Extract the PLC project entries from an XAE project file:
+        a list of (attribute, value) pairs, either the project file path
+        (`PrjFilePath`) or the independent project file (`File`).
+
+        The file is parsed as a stream that stops after the `Plc` section.
+        Processed elements are removed from the tree, so unrelated subtrees
+        (I/O configuration, mappings, etc.) are never kept in memory."""
+        projects = []
+        elements: list[Any] = []
+        with path.open("rb") as file:
+            for (event, element) in ElementTree.iterparse(
+                file, events=("start", "end")
+            ):
+                if event == "start":
+                    if (
+                        element.tag == "Project"
+                        and elements
+                        and _local_name(elements[-1].tag) == "Plc"
+                    ):
+                        attribute = next(
+                            (
+                                attribute
+                                for attribute in ["PrjFilePath", "File"]
+                                if attribute in element.attrib
+                            ),
+                            None,
+                        )
+                        if attribute is not None:
+                            projects.append([attribute, element.attrib[attribute]])
+                    elements.append(element)
+                    continue
+                elements.pop()
+                if _local_name(element.tag) == "Plc":
+                    break
+                if elements:
+                    elements[-1].remove(element)
+        return projects
+
+    @staticmethod
+    def _extract_independent_project(path: Path) -> str:
+        """Extract the PLC project file path from an independent project file.
+        Parsing stops at the first `Project` element."""
+        with path.open("rb") as file:
+            for (_, element) in ElementTree.iterparse(file, events=("start",)):
+                if _local_name(element.tag) == "Project":
+                    return str(element.attrib["PrjFilePath"])
+        raise ValueError(f"Missing project in independent project file: {path}")
+
+    @property
+    def xmlroot(self) -> Any:
+        """The root element of the XAE project file (parsed on first access)"""
+        if self._xmlroot is None:
+            self._xmlroot = ElementTree.parse(self.filepath).getroot()
+        return self._xmlroot
+
+    def _load_plc_projects(self) -> set[TcPlcProject]:
+        """Create the PLC projects of the XAE project"""
+        projects: list[TcPlcProject] = []
+        for (attribute, value) in self._projects:
+            if attribute == "PrjFilePath":
+                projects.append(
+                    load(TcPlcProject, self.filepath.parent / value, parent=self)
+                )
+            else:
+                # Independent project file
+                xti_path = self.filepath.parent / "_Config" / "PLC"
+                xti_file = xti_path / value
+                if not xti_file.exists():
+                    raise FileNotFoundError(
+                        f"Missing independent project file: {xti_file.absolute()}"
+                    )
+                prj_path = extract_facts(
+                    xti_file, "xti", self._extract_independent_project
+                )
+                projects.append(load(TcPlcProject, xti_path / prj_path, parent=self))
+        return set(projects)
 
     @property
     def plc_projects(self) -> Iterable[TcPlcProject]:
         """PLC projects in the XAE project"""
         if self._plc_projects is None:
-            projects: list[TcPlcProject] = []
-            for project in self.xmlroot.findall(".//{*}Plc/Project"):
-                if "PrjFilePath" in project.attrib:
-                    projects.append(
-                        TcPlcProject(
-                            self.filepath.parent / project.attrib["PrjFilePath"],
-                            parent=self,
-                        )
-                    )
-                elif "File" in project.attrib:
-                    # Independent project file
-                    xti_path = self.filepath.parent / "_Config" / "PLC"
-                    xti_file = xti_path / project.attrib["File"]
-                    if not xti_file.exists():
-                        raise FileNotFoundError(
-                            f"Missing independent project file: {xti_file.absolute()}"
-                        )
-                    xmlroot = ElementTree.parse(xti_file).getroot()
-                    prj_path = xmlroot.find(".//{*}Project").attrib["PrjFilePath"]
-                    projects.append(TcPlcProject(xti_path / prj_path, parent=self))
-
-            self._plc_projects = set(projects)
+            with self._lock:
+                if self._plc_projects is None:
+                    self._plc_projects = self._load_plc_projects()
         return iter(self._plc_projects)
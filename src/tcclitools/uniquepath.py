@@ -1,7 +1,13 @@
 """ A base class for objects that are uniquely based on a file or path"""
 from __future__ import annotations
 
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, TypeVar
+
+T = TypeVar("T", bound="UniquePath")
 
 
 class UniquePathException(Exception):
@@ -22,13 +28,27 @@ class UniquePath:
 
     _allowed_types: list[str | None] = []
 
-    def __init__(self, filepath: Path):
-        self.filepath = filepath.resolve()
-        if not self.filepath.exists():
-            raise FileNotFoundError(f"'{self.filepath}' does not exist")
-        extension_ok = (len(self._allowed_types) == 0) and self.filepath.is_file()
+    def __init__(self, filepath: Path, stat_result: os.stat_result | None = None):
+        """Validate the path with a single `lstat` call, or with the `stat_result`
+        of the path if it is already known (e.g., from directory discovery).
+        The path is made absolute without system calls; it is only resolved
+        when the path itself is a symbolic link."""
+        self.filepath = Path(os.path.abspath(filepath))
+        if stat_result is None:
+            try:
+                stat_result = os.lstat(self.filepath)
+                if stat.S_ISLNK(stat_result.st_mode):
+                    self.filepath = Path(os.path.realpath(self.filepath))
+                    stat_result = os.stat(self.filepath)
+            except (FileNotFoundError, NotADirectoryError) as exc:
+                raise FileNotFoundError(f"'{self.filepath}' does not exist") from exc
+        self._stat_result = stat_result
+        is_dir = stat.S_ISDIR(stat_result.st_mode)
+        extension_ok = (len(self._allowed_types) == 0) and stat.S_ISREG(
+            stat_result.st_mode
+        )
         for suffix in self._allowed_types:
-            if (suffix is None and self.filepath.is_dir()) or (
+            if (suffix is None and is_dir) or (
                 self.filepath.suffix in self._allowed_types
             ):
                 extension_ok = True
@@ -43,6 +63,24 @@ class UniquePath:
                 f"'{self.filepath}' does not match expected type: {type_string}"
             )
 
+    @classmethod
+    def from_paths(
+        cls: type[T],
+        paths: Iterable[Path | os.DirEntry[str]],
+        max_workers: int | None = None,
+    ) -> list[T]:
+        """Create objects for many paths at once. The paths are validated concurrently,
+        and the stat information of `DirEntry` objects (from directory discovery)
+        is reused instead of calling `stat` again."""
+
+        def create(path: Path | os.DirEntry[str]) -> T:
+            if isinstance(path, os.DirEntry):
+                return cls(Path(path.path), stat_result=path.stat())
+            return cls(path)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(create, paths))
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, UniquePath):
             return NotImplemented
@@ -0,0 +1,86 @@
+"""Bulk loading of all TwinCAT solutions in a folder"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from .dependencytree import get_all_solutions
+from .filewalker import IgnoreRules
+from .tclibraryreference import TcLibraryReference
+from .tcplcproject import TcPlcProject
+from .tcsolution import TcSolution
+from .tcxaeproject import TcXaeProject
+
+
+class Workspace:
+    """The TwinCAT solutions in a folder, with all of their projects loaded"""
+
+    def __init__(self, path: Path, solutions: Iterable[TcSolution]) -> None:
+        self.path = path
+        self.solutions = sorted(solutions, key=lambda solution: str(solution.filepath))
+
+    @property
+    def xae_projects(self) -> list[TcXaeProject]:
+        """XAE projects of all solutions in the workspace"""
+        return [
+            xae_project
+            for solution in self.solutions
+            for xae_project in sorted(
+                solution.xae_projects, key=lambda project: str(project.filepath)
+            )
+        ]
+
+    @property
+    def plc_projects(self) -> list[TcPlcProject]:
+        """PLC projects of all solutions in the workspace"""
+        return [
+            plc_project
+            for xae_project in self.xae_projects
+            for plc_project in sorted(
+                xae_project.plc_projects, key=lambda project: str(project.filepath)
+            )
+        ]
+
+    @property
+    def library_references(self) -> list[TcLibraryReference]:
+        """Libraries referenced by the PLC projects in the workspace, once per
+        reference string (an any-version reference equals all versions, so a set
+        would drop the references to specific versions)"""
+        references: dict[str, TcLibraryReference] = {}
+        for plc_project in self.plc_projects:
+            for reference in plc_project.library_references:
+                references.setdefault(str(reference), reference)
+        return list(references.values())
+
+
+def load_workspace(
+    path: Path, max_workers: int | None = None, ignore: IgnoreRules | None = None
+) -> Workspace:
+    """Load all solutions in a folder (including subfolders, except `ignore`d ones), and parse their
+    XAE projects, PLC projects and library references on up to `max_workers`
+    threads. Every level is parsed concurrently, so file I/O and parsing overlap."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        solutions = list(get_all_solutions(path, ignore))
+        xae_projects = [
+            xae_project
+            for projects in executor.map(
+                lambda solution: list(solution.xae_projects), solutions
+            )
+            for xae_project in projects
+        ]
+        plc_projects = [
+            plc_project
+            for projects in executor.map(
+                lambda xae_project: list(xae_project.plc_projects), xae_projects
+            )
+            for plc_project in projects
+        ]
+        # Consume the results, so errors are raised here instead of later on
+        list(
+            executor.map(
+                lambda plc_project: list(plc_project.library_references),
+                plc_projects,
+            )
+        )
+    return Workspace(path, solutions)
@@ -0,0 +1,61 @@
+"""Shared fixtures for the tcclitools tests"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+FAKE_TCBUILD = """\
+#!{python}
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("1.0.1.0")
+    sys.exit(0)
+with (Path(__file__).parent / "tcbuild.log").open("a", encoding="utf-8") as log:
+    log.write(" ".join(args) + "\\n")
+for line in range(int(os.environ.get("FAKE_TCBUILD_LINES", "0"))):
+    print(f"Compiling {{line}}", flush=True)
+fail = os.environ.get("FAKE_TCBUILD_FAIL")
+failed = bool(fail and any(fail in arg for arg in args))
+hang = os.environ.get("FAKE_TCBUILD_HANG")
+hanging = bool(hang and any(hang in arg for arg in args))
+if hanging:
+    # Start a child process that logs when it has not been killed after a second
+    subprocess.Popen([
+        sys.executable,
+        "-c",
+        "import sys, time; time.sleep(1); open(sys.argv[1], 'a').write('orphan')",
+        str(Path(__file__).parent / "tcbuild.log"),
+    ])
+if failed:
+    print(f"error C0001: Failed to {{args[0]}} {{args[1]}}", file=sys.stderr, flush=True)
+if hanging:
+    time.sleep(60)
+if failed:
+    sys.exit(1)
+print(f"Finished {{args[0]}} of {{args[1]}}")
+"""
+
+
+@pytest.fixture
+def fake_tcbuild(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Put a stand-in `tcbuild.exe` script on PATH, and return the path of the
+    file it logs its invocations to. Invocations with an argument that contains
+    the `FAKE_TCBUILD_FAIL` environment variable fail, and invocations with an
+    argument that contains `FAKE_TCBUILD_HANG` start a child process and then hang
+    (after printing the error of a failing invocation). Every invocation first
+    prints `FAKE_TCBUILD_LINES` lines of output."""
+    if sys.platform == "win32":
+        pytest.skip("The stand-in tcbuild.exe is a script")
+    script = tmp_path / "tcbuild.exe"
+    script.write_text(FAKE_TCBUILD.format(python=sys.executable), encoding="utf-8")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    return tmp_path / "tcbuild.log"
@@ -0,0 +1,63 @@
+"""Tests for the tcclitools AsyncTcBuild class"""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from tcclitools.asynctcbuild import AsyncTcBuild
+from tcclitools.exceptions import TcBuildTimeoutError
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+
+def test_build(fake_tcbuild: Path) -> None:
+    async def build_all() -> list[tuple[bool, str]]:
+        runner = AsyncTcBuild(max_concurrency=2)
+        return await asyncio.gather(
+            *(runner.build(RESOURCE_PATH / name) for name in ["LibA", "LibB", "LibC"])
+        )
+
+    assert asyncio.run(build_all()) == [(True, "")] * 3
+    assert len(fake_tcbuild.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_build_failed(fake_tcbuild: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # pylint: disable=unused-argument
+    monkeypatch.setenv("FAKE_TCBUILD_FAIL", "LibB")
+    (success, reason) = asyncio.run(AsyncTcBuild().build(RESOURCE_PATH / "LibB"))
+    assert not success
+    assert "Failed to build" in reason
+
+
+def test_timeout_kills_process_tree(
+    fake_tcbuild: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FAKE_TCBUILD_HANG", "LibA")
+    runner = AsyncTcBuild(timeout=0.5)
+    start = time.monotonic()
+    with pytest.raises(TcBuildTimeoutError):
+        asyncio.run(runner.run(["build", "LibA"]))
+    assert time.monotonic() - start < 10
+    (success, reason) = asyncio.run(runner.build(RESOURCE_PATH / "LibA", timeout=0.5))
+    assert not success
+    assert "did not finish" in reason
+    time.sleep(1.5)
+    assert "orphan" not in fake_tcbuild.read_text(encoding="utf-8")
+
+
+def test_cancel(fake_tcbuild: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FAKE_TCBUILD_HANG", "LibA")
+
+    async def cancel_build() -> None:
+        task = asyncio.create_task(AsyncTcBuild().run(["build", "LibA"]))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_build())
+    time.sleep(1.5)
+    assert "orphan" not in fake_tcbuild.read_text(encoding="utf-8")
@@ -0,0 +1,185 @@
+"""Tests for the tcclitools build executor"""
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tcclitools.buildexecutor import (
+    BuildResult,
+    BuildStatus,
+    execute_build,
+    install_libraries,
+)
+from tcclitools.buildstate import BuildState
+from tcclitools.dependencytree import DependencyTree
+from tcclitools.tclibraryreference import TcLibraryReference
+from tcclitools.tcplcproject import TcPlcProject
+from tcclitools.tcsolution import TcSolution
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+
+@pytest.fixture
+def diamond_tree() -> DependencyTree:
+    target_solution = TcSolution(
+        RESOURCE_PATH / "DiamondDependencies" / "DiamondDependencies.sln"
+    )
+    libraries = [
+        TcSolution(RESOURCE_PATH / name / f"{name}.sln")
+        for name in ["LibA", "LibB", "LibC"]
+    ]
+    return DependencyTree(target_solution, libraries)
+
+
+def statuses(
+    results: dict[TcSolution | TcPlcProject, BuildResult]
+) -> dict[str, BuildStatus]:
+    """Return the build statuses by solution name"""
+    return {
+        (
+            item.parent.parent if isinstance(item, TcPlcProject) else item
+        ).filepath.stem: result.status
+        for item, result in results.items()
+    }
+
+
+def test_execute_build(fake_tcbuild: Path, diamond_tree: DependencyTree) -> None:
+    results = execute_build(diamond_tree, max_workers=2)
+    assert set(results) == set(diamond_tree.get_build_order())
+    assert all(result.success for result in results.values())
+
+    # Every item is built after its dependencies
+    log = fake_tcbuild.read_text(encoding="utf-8").splitlines()
+    assert len(log) == 4
+    assert "LibA.sln" in "".join(log[:2])
+    assert "LibB.sln" in log[2]
+    assert log[3].startswith("build ")
+
+
+def test_execute_build_fail_fast(
+    fake_tcbuild: Path, diamond_tree: DependencyTree, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FAKE_TCBUILD_FAIL", "LibA.sln")
+    results = statuses(execute_build(diamond_tree, max_workers=1, fail_fast=True))
+    assert results["LibA"] == BuildStatus.FAILED
+    assert results["LibB"] == BuildStatus.SKIPPED
+    assert results["DiamondDependencies"] == BuildStatus.SKIPPED
+    assert "build " not in fake_tcbuild.read_text(encoding="utf-8")
+
+
+def test_execute_build_continue_on_error(
+    fake_tcbuild: Path, diamond_tree: DependencyTree, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FAKE_TCBUILD_FAIL", "LibA.sln")
+    results = statuses(execute_build(diamond_tree, max_workers=1, fail_fast=False))
+    assert results == {
+        "LibA": BuildStatus.FAILED,
+        "LibB": BuildStatus.SKIPPED,
+        "LibC": BuildStatus.SUCCEEDED,
+        "DiamondDependencies": BuildStatus.SKIPPED,
+    }
+
+
+def test_execute_build_incremental(
+    fake_tcbuild: Path, diamond_tree: DependencyTree, tmp_path: Path
+) -> None:
+    libraries = [
+        item.as_reference()
+        for item in diamond_tree.get_build_order()
+        if isinstance(item, TcPlcProject)
+    ]
+    state = BuildState(tmp_path / "state.json")
+    execute_build(diamond_tree, state=state, repository=libraries)  # type:ignore
+    assert len(fake_tcbuild.read_text(encoding="utf-8").splitlines()) == 4
+
+    # Second build: the libraries are up-to-date, only the solution is built
+    fake_tcbuild.unlink()
+    state = BuildState(tmp_path / "state.json")
+    results = statuses(
+        execute_build(diamond_tree, state=state, repository=libraries)  # type:ignore
+    )
+    assert results == {
+        "LibA": BuildStatus.UP_TO_DATE,
+        "LibB": BuildStatus.UP_TO_DATE,
+        "LibC": BuildStatus.UP_TO_DATE,
+        "DiamondDependencies": BuildStatus.SUCCEEDED,
+    }
+    assert fake_tcbuild.read_text(encoding="utf-8").startswith("build ")
+
+
+def test_install_libraries(fake_tcbuild: Path, diamond_tree: DependencyTree) -> None:
+    results = statuses(install_libraries([diamond_tree, diamond_tree]))  # type:ignore
+    assert results == {
+        "LibA": BuildStatus.SUCCEEDED,
+        "LibB": BuildStatus.SUCCEEDED,
+        "LibC": BuildStatus.SUCCEEDED,
+    }
+    log = fake_tcbuild.read_text(encoding="utf-8").splitlines()
+    assert len(log) == 3
+    assert all(line.startswith("install ") for line in log)
+
+
+def test_install_libraries_deduplicated(fake_tcbuild: Path, tmp_path: Path) -> None:
+    # A copy of the same library version with identical content is installed once
+    for name in ["LibA", "LibB"]:
+        shutil.copytree(RESOURCE_PATH / name, tmp_path / name)
+    trees = [
+        DependencyTree(
+            TcSolution(path / "LibB" / "LibB.sln"),
+            [TcSolution(path / "LibA" / "LibA.sln")],
+        )
+        for path in [RESOURCE_PATH, tmp_path]
+    ]
+    results = install_libraries(trees)
+    assert [result.status for result in results.values()] == [
+        BuildStatus.SUCCEEDED,
+        BuildStatus.UP_TO_DATE,
+    ]
+    assert len(fake_tcbuild.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_install_libraries_incremental(
+    fake_tcbuild: Path, diamond_tree: DependencyTree, tmp_path: Path
+) -> None:
+    libraries = [
+        item.as_reference()
+        for item in diamond_tree.get_build_order()
+        if isinstance(item, TcPlcProject)
+    ]
+    state = BuildState(tmp_path / "state.json")
+    install_libraries([diamond_tree], state=state, repository=libraries)  # type:ignore
+    fake_tcbuild.unlink()
+
+    # Only the libraries that are not installed are installed again
+    state = BuildState(tmp_path / "state.json")
+    results = statuses(
+        install_libraries(
+            [diamond_tree], state=state, repository=libraries[1:]  # type:ignore
+        )
+    )
+    assert list(results.values()).count(BuildStatus.UP_TO_DATE) == 2
+    assert len(fake_tcbuild.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_install_libraries_fail_fast(
+    fake_tcbuild: Path, diamond_tree: DependencyTree, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FAKE_TCBUILD_FAIL", "LibA.sln")
+    results = statuses(install_libraries([diamond_tree]))  # type:ignore
+    assert results["LibA"] == BuildStatus.FAILED
+    assert results["LibB"] == BuildStatus.SKIPPED
+    assert len(fake_tcbuild.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_install_libraries_repository_without_state(
+    fake_tcbuild: Path, diamond_tree: DependencyTree
+) -> None:
+    libraries = [TcLibraryReference("LibA", "*", "Industrial Brains B.V.")]
+    with pytest.raises(ValueError):
+        install_libraries([diamond_tree], repository=libraries)
+    with pytest.raises(ValueError):
+        execute_build(diamond_tree, repository=libraries)
+    assert not fake_tcbuild.exists()
@@ -0,0 +1,67 @@
+"""Tests for the tcclitools build state"""
+# pylint: disable=missing-function-docstring
+
+import shutil
+from pathlib import Path
+
+from tcclitools.buildstate import BuildState, fingerprint, get_fingerprints
+from tcclitools.dependencytree import DependencyTree
+from tcclitools.libraryindex import LibraryIndex
+from tcclitools.tcplcproject import TcPlcProject
+from tcclitools.tcsolution import TcSolution
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+
+def copy_resources(tmp_path: Path, *names: str) -> Path:
+    for name in names:
+        shutil.copytree(RESOURCE_PATH / name, tmp_path / name)
+    return tmp_path
+
+
+def test_fingerprint_source_files(tmp_path: Path) -> None:
+    path = copy_resources(tmp_path, "PlcDefault") / "PlcDefault" / "PlcDefault"
+    plc_project = TcPlcProject(
+        path / "StandardPlcProject" / "StandardPlcProject.plcproj"
+    )
+    assert fingerprint(plc_project, []) == fingerprint(plc_project, [])
+
+    original = fingerprint(plc_project, [])
+    assert fingerprint(plc_project, ["dependency"]) != original
+    with (path / "StandardPlcProject" / "POUs" / "MAIN.TcPOU").open("a") as file:
+        file.write("\n")
+    assert fingerprint(plc_project, []) != original
+
+
+def test_fingerprint_dependencies(tmp_path: Path) -> None:
+    path = copy_resources(tmp_path, "LibA", "LibB", "LibC", "DiamondDependencies")
+    solutions = [
+        TcSolution(path / name / f"{name}.sln")
+        for name in ["DiamondDependencies", "LibA", "LibB", "LibC"]
+    ]
+    lib_a, lib_b, lib_c = [next(solution.plc_projects) for solution in solutions[1:]]
+    original = get_fingerprints(DependencyTree(solutions[0], solutions[1:]))
+    assert set(original) == {lib_a, lib_b, lib_c}
+
+    # Changing library A changes the fingerprint of library B (depends on A)
+    with lib_a.filepath.open("a", encoding="utf-8") as file:
+        file.write("\n")
+    changed = get_fingerprints(DependencyTree(solutions[0], solutions[1:]))
+    assert changed[lib_a] != original[lib_a]
+    assert changed[lib_b] != original[lib_b]
+    assert changed[lib_c] == original[lib_c]
+
+
+def test_build_state(tmp_path: Path) -> None:
+    path = RESOURCE_PATH / "LibA" / "LibA" / "Untitled1" / "Untitled1.plcproj"
+    plc_project = TcPlcProject(path)
+    repository = LibraryIndex([plc_project.as_reference()])  # type:ignore
+    state = BuildState(tmp_path / "state.json")
+    assert not state.is_up_to_date(plc_project, "abc", repository)
+
+    state.update(plc_project, "abc")
+    state.save()
+    state = BuildState(tmp_path / "state.json")
+    assert state.is_up_to_date(plc_project, "abc", repository)
+    assert not state.is_up_to_date(plc_project, "def", repository)
+    assert not state.is_up_to_date(plc_project, "abc", LibraryIndex())
@@ -2,17 +2,22 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=line-too-long
 
+import io
+import shutil
 from pathlib import Path
 
 import pytest
-from anytree.search import find
+from anytree import RenderTree
+from anytree.search import find, findall
 
 from tcclitools.dependencytree import (
+    CircularDependencyError,
     DependencyTree,
     MissingLibrariesError,
     TcNode,
     get_all_solutions,
     render_tree,
+    write_tree,
 )
 from tcclitools.tclibraryreference import TcLibraryReference
 from tcclitools.tcplcproject import TcPlcProject
@@ -93,6 +98,29 @@ def test_dependency_tree_missing_libraries() -> None:
     assert tree.missing_libraries == expected
 
 
+def test_dependency_tree_missing_versions(tmp_path: Path) -> None:
+    # LibB depends on a specific version of LibA, the target on any version
+    shutil.copytree(RESOURCE_PATH / "LibB", tmp_path / "LibB")
+    plcproj = tmp_path / "LibB" / "LibB" / "Untitled1" / "Untitled1.plcproj"
+    plcproj.write_text(
+        plcproj.read_text(encoding="utf-8").replace(
+            "LibA, * (Industrial Brains B.V.)", "LibA, 9.9.9.9 (Industrial Brains B.V.)"
+        ),
+        encoding="utf-8",
+    )
+    tree = DependencyTree(
+        TcSolution(RESOURCE_PATH / "DiamondDependencies" / "DiamondDependencies.sln"),
+        [
+            TcSolution(tmp_path / "LibB" / "LibB.sln"),
+            TcSolution(RESOURCE_PATH / "LibC" / "LibC.sln"),
+        ],
+    )
+    assert {str(reference) for reference in tree.missing_libraries} == {
+        "LibA, * (Industrial Brains B.V.)",
+        "LibA, 9.9.9.9 (Industrial Brains B.V.)",
+    }
+
+
 def test_get_all_solutions() -> None:
     path = RESOURCE_PATH / "Solution"
     assert list(get_all_solutions(path)) == [TcSolution(path / "Solution.sln")]
@@ -129,3 +157,106 @@ def test_multiple_libraries_in_one_solution() -> None:
     expected = [library, target_solution]
     build_order = DependencyTree(target_solution, [library_solution]).get_build_order()
     assert build_order == expected
+
+
+def test_shared_dependencies() -> None:
+    # LibA is a dependency of both the solution and LibB
+    target_solution = TcSolution(
+        RESOURCE_PATH / "DiamondDependencies" / "DiamondDependencies.sln"
+    )
+    lib_b = TcSolution(RESOURCE_PATH / "LibB" / "LibB.sln")
+    tree = DependencyTree(target_solution, [LIB_A, lib_b])
+    lib_a_project = next(LIB_A.plc_projects)
+
+    # The graph contains a single vertex for LibA, the tree contains both paths
+    assert [vertex for vertex in tree.graph if vertex == lib_a_project] == [
+        lib_a_project
+    ]
+    assert len(findall(tree.trunk, lambda node: node.origin == lib_a_project)) == 2
+
+
+def test_get_build_waves() -> None:
+    target_solution = TcSolution(
+        RESOURCE_PATH / "DiamondDependencies" / "DiamondDependencies.sln"
+    )
+    lib_b = TcSolution(RESOURCE_PATH / "LibB" / "LibB.sln")  # depends on A
+    lib_c = TcSolution(RESOURCE_PATH / "LibC" / "LibC.sln")
+    tree = DependencyTree(target_solution, [LIB_A, lib_b, lib_c])
+    expected = [
+        [next(LIB_A.plc_projects), next(lib_c.plc_projects)],
+        [next(lib_b.plc_projects)],
+        [target_solution],
+    ]
+    assert tree.get_build_waves() == expected
+    assert tree.get_build_order() == [item for wave in expected for item in wave]
+
+
+def test_get_build_order_circular_dependency() -> None:
+    lib_a = TcSolution(RESOURCE_PATH / "LibCycleA" / "LibCycleA.sln")
+    lib_b = TcSolution(RESOURCE_PATH / "LibCycleB" / "LibCycleB.sln")
+    with pytest.raises(CircularDependencyError, match="LibCycleB"):
+        DependencyTree(lib_a, [lib_a, lib_b]).get_build_order()
+
+
+def test_circular_dependency_chain() -> None:
+    lib_a = TcSolution(RESOURCE_PATH / "LibCycleA" / "LibCycleA.sln")
+    lib_b = TcSolution(RESOURCE_PATH / "LibCycleB" / "LibCycleB.sln")
+    plc_a = next(lib_a.plc_projects)
+    plc_b = next(lib_b.plc_projects)
+    with pytest.raises(CircularDependencyError) as exc_info:
+        DependencyTree(lib_a, [lib_a, lib_b])
+    expected_chain = [
+        plc_a,
+        next(plc_a.library_references),
+        plc_b,
+        next(plc_b.library_references),
+        plc_a,
+    ]
+    assert str(exc_info.value).endswith(
+        " -> ".join(str(item) for item in expected_chain)
+    )
+
+
+def diamond_tree() -> DependencyTree:
+    target_solution = TcSolution(
+        RESOURCE_PATH / "DiamondDependencies" / "DiamondDependencies.sln"
+    )
+    libraries = [
+        TcSolution(RESOURCE_PATH / name / f"{name}.sln")
+        for name in ["LibA", "LibB", "LibC"]
+    ]
+    return DependencyTree(target_solution, libraries)
+
+
+def test_render_tree_matches_anytree() -> None:
+    tree = diamond_tree()
+    expected = "".join(
+        f"{pre}{node.origin}\n" for pre, _, node in RenderTree(tree.trunk)
+    )
+    assert render_tree(tree.trunk) == expected
+    assert str(tree) == expected
+
+
+def test_write_tree_max_depth() -> None:
+    tree = diamond_tree()
+    stream = io.StringIO()
+    tree.write(stream, max_depth=2)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3  # solution, XAE project and PLC project
+    assert lines == str(tree).splitlines()[:3]
+
+
+def test_write_tree_deduplicate() -> None:
+    tree = diamond_tree()
+    stream = io.StringIO()
+    tree.write(stream, deduplicate=True)
+    output = stream.getvalue()
+    lib_a_reference = "LibA, * (Industrial Brains B.V.)"
+    # LibA is referenced by the solution and by LibB, its subtree is written once
+    assert output.count(lib_a_reference) == 2
+    assert output.count(f"{lib_a_reference} [see above]") == 1
+    assert output.count(str(next(LIB_A.plc_projects))) == 1
+
+    trunk_stream = io.StringIO()
+    write_tree(tree.trunk, trunk_stream, deduplicate=True)
+    assert trunk_stream.getvalue() == output
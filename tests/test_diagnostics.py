@@ -0,0 +1,89 @@
+"""Tests for the tcclitools diagnostics module"""
+# pylint: disable=missing-function-docstring
+
+import time
+from pathlib import Path
+
+import pytest
+
+from tcclitools import tcbuild
+from tcclitools.diagnostics import (
+    Diagnostic,
+    DiagnosticsParser,
+    Severity,
+    parse_diagnostics,
+)
+from tcclitools.exceptions import BuildAbortedError
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+OUTPUT = r"""------ Build started: Project: LibA, Configuration: Release TwinCAT RT (x64) ------
+Build started: Application: Untitled1.Untitled1 Project
+typify code...
+POUs\MAIN.TcPOU(3): warning C0373: Unused variable 'y'
+C:\Plc\POUs\FB_Foo.TcPOU(12,5): error C0046: Identifier 'x' not defined [C:\Plc\LibB.plcproj]
+Error: C0032: Cannot convert type 'INT' to type 'STRING'
+Compile complete -- 2 errors, 1 warnings
+Build succeeded: error handling is not a diagnostic
+"""
+
+
+def test_parse_diagnostics() -> None:
+    assert list(parse_diagnostics(OUTPUT.splitlines())) == [
+        Diagnostic(
+            Severity.WARNING,
+            "Unused variable 'y'",
+            project="Untitled1.Untitled1",
+            file="POUs\\MAIN.TcPOU",
+            line=3,
+            code="C0373",
+        ),
+        Diagnostic(
+            Severity.ERROR,
+            "Identifier 'x' not defined",
+            project="LibB",
+            file="C:\\Plc\\POUs\\FB_Foo.TcPOU",
+            line=12,
+            code="C0046",
+        ),
+        Diagnostic(
+            Severity.ERROR,
+            "Cannot convert type 'INT' to type 'STRING'",
+            project="Untitled1.Untitled1",
+            code="C0032",
+        ),
+    ]
+
+
+def test_parser_counts() -> None:
+    diagnostics: list[Diagnostic] = []
+    parser = DiagnosticsParser(on_diagnostic=diagnostics.append)
+    for line in OUTPUT.splitlines():
+        parser.feed(line)
+    assert (parser.errors, parser.warnings) == (2, 1)
+    assert parser.first_error == diagnostics[1]
+    assert str(diagnostics[1]) == (
+        "C:\\Plc\\POUs\\FB_Foo.TcPOU(12): error C0046: Identifier 'x' not defined"
+    )
+
+
+def test_parser_fail_fast() -> None:
+    parser = DiagnosticsParser(fail_fast=True)
+    with pytest.raises(BuildAbortedError):
+        for line in OUTPUT.splitlines():
+            parser.feed(line)
+    assert parser.errors == 1
+
+
+def test_build_fail_fast(fake_tcbuild: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FAKE_TCBUILD_FAIL", "LibA")
+    monkeypatch.setenv("FAKE_TCBUILD_HANG", "LibA")
+    parser = DiagnosticsParser(fail_fast=True)
+    start = time.monotonic()
+    (success, reason) = tcbuild.build(RESOURCE_PATH / "LibA", on_line=parser.on_line)
+    assert time.monotonic() - start < 10
+    assert not success
+    assert "error C0001: Failed to build" in reason
+    # The child process of TcBuild has been killed as well
+    time.sleep(1.5)
+    assert "orphan" not in fake_tcbuild.read_text(encoding="utf-8")
@@ -0,0 +1,58 @@
+"""Tests for the tcclitools filewalker module"""
+# pylint: disable=missing-function-docstring
+
+from pathlib import Path
+
+from tcclitools.filewalker import DEFAULT_IGNORE_PATTERNS, IgnoreRules, walk
+
+
+def create_files(root: Path, *paths: str) -> None:
+    for path in paths:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).touch()
+
+
+def found(root: Path, pattern: str, **kwargs: object) -> list[str]:
+    return [
+        Path(entry.path).relative_to(root).as_posix()
+        for entry in walk(root, pattern, **kwargs)  # type:ignore
+    ]
+
+
+def test_walk(tmp_path: Path) -> None:
+    create_files(tmp_path, "b/B.sln", "a/A.sln", "a/A.tsproj", "Root.sln")
+    assert found(tmp_path, "*.sln") == ["Root.sln", "a/A.sln", "b/B.sln"]
+
+
+def test_walk_default_ignore(tmp_path: Path) -> None:
+    create_files(tmp_path, "A.sln", ".git/B.sln", "Plc/_Boot/C.sln", "bin/D.sln")
+    ignore = IgnoreRules(DEFAULT_IGNORE_PATTERNS)
+    assert found(tmp_path, "*.sln", ignore=ignore) == ["A.sln"]
+
+
+def test_walk_max_depth(tmp_path: Path) -> None:
+    create_files(
+        tmp_path, "a/browsercache", "a/b/c/browsercache", "a/b/c/d/browsercache"
+    )
+    assert found(tmp_path, "browsercache", max_depth=3) == [
+        "a/browsercache",
+        "a/b/c/browsercache",
+    ]
+
+
+def test_ignore_rules() -> None:
+    rules = IgnoreRules(["# comment", "", "*.bak", "build/", "/Top", "!keep.bak"])
+    assert rules.is_ignored("sub/file.bak", is_dir=False)
+    assert not rules.is_ignored("sub/keep.bak", is_dir=False)
+    assert rules.is_ignored("sub/build", is_dir=True)
+    assert not rules.is_ignored("sub/build", is_dir=False)
+    assert rules.is_ignored("Top", is_dir=True)
+    assert not rules.is_ignored("sub/Top", is_dir=True)
+
+
+def test_ignore_rules_from_file(tmp_path: Path) -> None:
+    ignore_file = tmp_path / ".gitignore"
+    ignore_file.write_text("Old/\n", encoding="utf-8")
+    create_files(tmp_path, "New/A.sln", "Old/B.sln", "obj/C.sln")
+    rules = IgnoreRules.from_file(ignore_file)
+    assert found(tmp_path, "*.sln", ignore=rules) == ["New/A.sln"]
@@ -0,0 +1,99 @@
+"""Tests for the tcclitools LibraryIndex class"""
+# pylint: disable=missing-function-docstring
+
+from pathlib import Path
+
+from tcclitools.libraryindex import LayeredRepository, LibraryIndex
+from tcclitools.tclibraryreference import TcLibraryReference
+from tcclitools.tcrepolibrary import TcRepoLibrary, get_library_repository
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+TITLE = "foo"
+COMPANY = "bar"
+
+
+def test_resolve_any_version() -> None:
+    lib_v1 = TcLibraryReference(TITLE, "1", COMPANY)
+    lib_v3 = TcLibraryReference(TITLE, "3", COMPANY)
+    lib_v2 = TcLibraryReference(TITLE, "2", COMPANY)
+    index = LibraryIndex([lib_v1, lib_v3, lib_v2])
+    resolved = index.resolve(TcLibraryReference(TITLE, "*", COMPANY))
+    assert resolved is not None
+    assert str(resolved) == str(lib_v3)
+
+
+def test_resolve_specific_version() -> None:
+    lib_v1 = TcLibraryReference(TITLE, "1", COMPANY)
+    lib_v2 = TcLibraryReference(TITLE, "2", COMPANY)
+    index = LibraryIndex([lib_v1, lib_v2])
+    resolved = index.resolve(TcLibraryReference(TITLE, "1", COMPANY))
+    assert resolved is not None
+    assert str(resolved) == str(lib_v1)
+    assert index.resolve(TcLibraryReference(TITLE, "3", COMPANY)) is None
+
+
+def test_resolve_case_insensitive() -> None:
+    index = LibraryIndex([TcLibraryReference(TITLE, "1", COMPANY)])
+    assert TcLibraryReference(TITLE.upper(), "*", COMPANY.upper()) in index
+
+
+def test_resolve_missing() -> None:
+    index = LibraryIndex([TcLibraryReference(TITLE, "1", COMPANY)])
+    assert index.resolve(TcLibraryReference(COMPANY, "*", TITLE)) is None
+
+
+def test_unique_versions() -> None:
+    index = LibraryIndex(
+        [
+            TcLibraryReference(TITLE, "1", COMPANY),
+            TcLibraryReference(TITLE, "1", COMPANY),
+            TcLibraryReference(TITLE, "2", COMPANY),
+        ]
+    )
+    assert len(index) == 2
+
+
+def test_resolve_all() -> None:
+    index = LibraryIndex(
+        [
+            TcLibraryReference(TITLE, "1", COMPANY),
+            TcLibraryReference(TITLE, "2", COMPANY),
+            TcLibraryReference("other", "1", COMPANY),
+        ]
+    )
+    any_version = TcLibraryReference(TITLE, "*", COMPANY)
+    version_1 = TcLibraryReference(TITLE, "1", COMPANY)
+    other = TcLibraryReference("other", "*", COMPANY)
+    missing = TcLibraryReference(TITLE, "3", COMPANY)
+    resolution = index.resolve_all(
+        [any_version, version_1, other, missing, any_version, missing]
+    )
+    assert [(str(ref), str(lib)) for (ref, lib) in resolution.resolved] == [
+        (str(any_version), str(TcLibraryReference(TITLE, "2", COMPANY))),
+        (str(version_1), str(version_1)),
+        (str(other), str(TcLibraryReference("other", "1", COMPANY))),
+    ]
+    assert [str(ref) for ref in resolution.missing] == [str(missing)]
+    assert [str(ref) for (ref, _) in resolution.ambiguous] == [str(any_version)]
+
+
+def test_layered_repository() -> None:
+    company = "Beckhoff Automation GmbH"
+    repository = LayeredRepository(
+        [
+            get_library_repository(RESOURCE_PATH / "Managed Libraries"),
+            [
+                TcLibraryReference("Tc2_Standard", "3.3.3.0", company),
+                TcLibraryReference("Tc2_Standard", "3.3.4.0", company),
+            ],
+        ]
+    )
+    # The first source wins
+    installed = repository.resolve(
+        TcLibraryReference("Tc2_Standard", "3.3.3.0", company)
+    )
+    assert isinstance(installed, TcRepoLibrary)
+    latest = repository.resolve(TcLibraryReference("Tc2_Standard", "*", company))
+    assert str(latest) == f"Tc2_Standard, 3.3.4.0 ({company})"
+    assert not isinstance(latest, TcRepoLibrary)
@@ -0,0 +1,134 @@
+"""Tests for the tcclitools ParseCache class"""
+# pylint: disable=missing-function-docstring
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+import tcclitools.parsecache
+from tcclitools.parsecache import ParseCache, set_parse_cache
+from tcclitools.tcplcproject import TcPlcProject
+from tcclitools.tcrepolibrary import TcRepoLibrary
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Iterator[ParseCache]:
+    parse_cache = ParseCache(tmp_path / "cache" / "parsecache.db")
+    set_parse_cache(parse_cache)
+    yield parse_cache
+    set_parse_cache(None)
+    parse_cache.close()
+
+
+def test_cache_hit(cache: ParseCache, tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("foo", encoding="utf-8")
+    calls = []
+
+    def extract(file_path: Path) -> list[str]:
+        calls.append(file_path)
+        return [file_path.read_text(encoding="utf-8")]
+
+    assert cache.get_or_extract(path, "text", extract) == ["foo"]
+    assert cache.get_or_extract(path, "text", extract) == ["foo"]
+    assert len(calls) == 1
+
+    # A cache file can be shared
+    other_cache = ParseCache(cache.path)
+    assert other_cache.get_or_extract(path, "text", extract) == ["foo"]
+    assert len(calls) == 1
+    other_cache.close()
+
+
+def test_cache_invalidated(cache: ParseCache, tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("foo", encoding="utf-8")
+
+    def extract(file_path: Path) -> str:
+        return file_path.read_text(encoding="utf-8")
+
+    assert cache.get_or_extract(path, "text", extract) == "foo"
+    path.write_text("foobar", encoding="utf-8")
+    assert cache.get_or_extract(path, "text", extract) == "foobar"
+    stat = path.stat()
+    path.write_text("barfoo", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get_or_extract(path, "text", extract) == "barfoo"
+
+
+def test_facts_version(
+    cache: ParseCache, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("foo", encoding="utf-8")
+    assert cache.get_or_extract(path, "text", lambda _: "old", path.stat()) == "old"
+    assert cache.get_or_extract(path, "text", lambda _: "new", path.stat()) == "old"
+
+    # Facts of another version are discarded
+    monkeypatch.setattr(tcclitools.parsecache, "FACTS_VERSION", 2)
+    other_cache = ParseCache(cache.path)
+    assert other_cache.get_or_extract(path, "text", lambda _: "new") == "new"
+    other_cache.close()
+
+
+def test_cached_plc_project(cache: ParseCache, tmp_path: Path) -> None:
+    # pylint: disable=unused-argument
+    shutil.copytree(RESOURCE_PATH / "PlcDefault", tmp_path / "PlcDefault")
+    path = (
+        tmp_path
+        / "PlcDefault"
+        / "PlcDefault"
+        / "StandardPlcProject"
+        / "StandardPlcProject.plcproj"
+    )
+    expected = set(TcPlcProject(path).library_references)
+    # Facts are read from the cache, the project file itself is not parsed
+    stat = path.stat()
+    path.write_bytes(b" " * stat.st_size)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert set(TcPlcProject(path).library_references) == expected
+
+
+def test_cached_repo_library(cache: ParseCache) -> None:
+    path = (
+        RESOURCE_PATH
+        / "Managed Libraries"
+        / "Beckhoff Automation GmbH"
+        / "Tc2_Standard"
+        / "3.3.3.0"
+    )
+    library = TcRepoLibrary(path)
+    cached_name = cache.get_or_extract(
+        path / "browsercache", "browsercache", lambda _: "not cached"
+    )
+    assert cached_name == str(library)
+
+
+def test_cached_repo_library_single_stat(
+    cache: ParseCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument
+    path = (
+        RESOURCE_PATH
+        / "Managed Libraries"
+        / "Beckhoff Automation GmbH"
+        / "Tc2_Standard"
+        / "3.3.3.0"
+    )
+    TcRepoLibrary(path)
+    calls = []
+    original_stat = os.stat
+
+    def counting_stat(*args: Any, **kwargs: Any) -> os.stat_result:
+        calls.append(args[0])
+        return original_stat(*args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", counting_stat)
+    TcRepoLibrary(path)
+    # Only the browsercache file is checked, once
+    assert len(calls) == 1
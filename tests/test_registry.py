@@ -0,0 +1,104 @@
+"""Tests for the tcclitools Registry class"""
+# pylint: disable=missing-function-docstring
+
+import os
+from pathlib import Path
+
+import pytest
+
+import tcclitools.registry
+from tcclitools.registry import Registry, load
+from tcclitools.tcsolution import TcSolution
+from tcclitools.uniquepath import UniquePath
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+
+def test_same_object() -> None:
+    registry = Registry()
+    path = RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs.sln"
+    solution = registry.get(TcSolution, path)
+    assert (
+        registry.get(TcSolution, path.parent / ".." / path.parent.name / path.name)
+        is solution
+    )
+    assert solution in registry
+
+
+def test_hit_without_stat(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = Registry()
+    (tmp_path / "a").touch()
+    file_a = registry.get(UniquePath, tmp_path / "a")
+    monkeypatch.setattr(os, "stat", None)
+    monkeypatch.setattr(os, "lstat", None)
+    assert registry.get(UniquePath, tmp_path / "a") is file_a
+
+
+def test_shared_projects(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tcclitools.registry, "_registry", Registry())
+    path = RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs.sln"
+    projects = {id(project) for project in load(TcSolution, path).plc_projects}
+    assert projects == {id(project) for project in load(TcSolution, path).plc_projects}
+
+
+def test_disabled_by_default() -> None:
+    path = RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs.sln"
+    first = TcSolution(path)
+    second = TcSolution(path)
+    for solution in (first, second):
+        assert all(xae.parent is solution for xae in solution.xae_projects)
+        assert solution.children
+
+
+def test_invalidate(tmp_path: Path) -> None:
+    registry = Registry()
+    (tmp_path / "a").touch()
+    (tmp_path / "b").touch()
+    file_a = registry.get(UniquePath, tmp_path / "a")
+    file_b = registry.get(UniquePath, tmp_path / "b")
+    registry.invalidate(tmp_path / "a")
+    assert file_a not in registry
+    assert file_b in registry
+    assert registry.get(UniquePath, tmp_path / "a") is not file_a
+    registry.invalidate()
+    assert len(registry) == 0
+
+
+def test_invalidate_parents(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = Registry()
+    monkeypatch.setattr(tcclitools.registry, "_registry", registry)
+    path = RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs.sln"
+    solution = load(TcSolution, path)
+    plc_project = next(iter(solution.plc_projects))
+    assert plc_project in registry
+    registry.invalidate(plc_project.filepath)
+    assert plc_project not in registry
+    assert solution not in registry
+
+
+def test_reload_after_invalidate(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = Registry()
+    monkeypatch.setattr(tcclitools.registry, "_registry", registry)
+    path = RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs.sln"
+    solution = load(TcSolution, path)
+    xae_project = next(iter(solution.xae_projects))
+    registry.invalidate(solution.filepath)
+    assert xae_project in registry
+
+    # The reloaded solution adopts the XAE project that was kept
+    reloaded = load(TcSolution, path)
+    assert reloaded is not solution
+    assert next(iter(reloaded.xae_projects)) is xae_project
+    assert xae_project.parent is reloaded
+
+
+def test_invalidate_modified(tmp_path: Path) -> None:
+    registry = Registry()
+    (tmp_path / "a").write_text("a", encoding="utf-8")
+    (tmp_path / "b").write_text("b", encoding="utf-8")
+    file_a = registry.get(UniquePath, tmp_path / "a")
+    file_b = registry.get(UniquePath, tmp_path / "b")
+    (tmp_path / "a").write_text("modified", encoding="utf-8")
+    os.remove(tmp_path / "b")
+    assert set(registry.invalidate_modified()) == {file_a.filepath, file_b.filepath}
+    assert len(registry) == 0
@@ -0,0 +1,79 @@
+"""Tests for the tcclitools RepositoryIndex class"""
+# pylint: disable=missing-function-docstring
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tcclitools import tcbuild
+from tcclitools.repositoryindex import RepositoryIndex, load_repository_index
+from tcclitools.tcrepolibrary import TcRepoLibrary
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+COMPANY = "Beckhoff Automation GmbH"
+
+
+@pytest.fixture(name="repository")
+def fixture_repository(tmp_path: Path) -> Path:
+    shutil.copytree(RESOURCE_PATH / "Managed Libraries", tmp_path / "repository")
+    return tmp_path / "repository"
+
+
+def add_version(repository: Path, title: str, version: str) -> None:
+    source = next((repository / COMPANY / title).iterdir())
+    shutil.copytree(source, repository / COMPANY / title / version)
+    browsercache = repository / COMPANY / title / version / "browsercache"
+    browsercache.write_text(
+        browsercache.read_text(encoding="utf-8").replace(source.name, version),
+        encoding="utf-8",
+    )
+
+
+def test_index(repository: Path, tmp_path: Path) -> None:
+    index = load_repository_index(tmp_path / "index.json", repository)
+    assert sorted(str(library) for library in index) == [
+        f"Tc2_Standard, 3.3.3.0 ({COMPANY})",
+        f"Tc2_System, 3.4.25.0 ({COMPANY})",
+    ]
+    assert (tmp_path / "index.json").exists()
+
+
+def test_refresh_unchanged(
+    repository: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    load_repository_index(tmp_path / "index.json", repository)
+
+    def fail(_: Path) -> str:
+        raise AssertionError("browsercache parsed again")
+
+    monkeypatch.setattr(TcRepoLibrary, "_extract_full_name", staticmethod(fail))
+    index = RepositoryIndex(tmp_path / "index.json", repository)
+    assert not index.refresh()
+    assert len(index) == 2
+
+
+def test_refresh_changes(repository: Path, tmp_path: Path) -> None:
+    index = load_repository_index(tmp_path / "index.json", repository)
+    add_version(repository, "Tc2_Standard", "3.3.4.0")
+    shutil.rmtree(repository / COMPANY / "Tc2_System")
+    assert index.refresh()
+    assert sorted(str(library) for library in index) == [
+        f"Tc2_Standard, 3.3.3.0 ({COMPANY})",
+        f"Tc2_Standard, 3.3.4.0 ({COMPANY})",
+    ]
+    reloaded = RepositoryIndex(tmp_path / "index.json", repository)
+    assert sorted(map(str, reloaded)) == sorted(map(str, index))
+
+
+def test_refresh_after_install(
+    fake_tcbuild: Path, repository: Path, tmp_path: Path
+) -> None:
+    # pylint: disable=unused-argument
+    index = load_repository_index(tmp_path / "index.json", repository)
+    add_version(repository, "Tc2_Standard", "3.3.4.0")
+    (success, _) = tcbuild.install(
+        RESOURCE_PATH / "LibA" / "LibA.sln", "LibA", "Untitled1", repository_index=index
+    )
+    assert success
+    assert len(index) == 3
@@ -1,10 +1,12 @@
 """Tests for the tcclitools TcSolution class"""
 # pylint: disable=missing-function-docstring
 
+import os
 from pathlib import Path
 
 import pytest
 
+from tcclitools import tcbuild
 from tcclitools.tcbuild import build, install, is_available
 
 tcbuild_available, reason = is_available()
@@ -28,3 +30,81 @@ def test_build_solution() -> None:
 def test_install_library() -> None:
     (success, _) = install(RESOURCE_PATH / "LibA" / "LibA.sln", "LibA", "Untitled1")
     assert success
+
+
+def test_is_available_memoized(
+    fake_tcbuild: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument
+    calls = []
+    original_run = tcbuild.run
+
+    def counting_run(args: list[str]) -> tuple[int, str]:
+        calls.append(args)
+        return original_run(args)
+
+    monkeypatch.setattr(tcbuild, "run", counting_run)
+    tcbuild.refresh_probe()
+    assert is_available() == (True, "")
+    assert is_available() == (True, "")
+    assert len(calls) == 1
+
+    # Modifying the executable invalidates the cached result
+    os.utime(tmp_path / "tcbuild.exe", ns=(0, 0))
+    assert is_available() == (True, "")
+    assert len(calls) == 2
+
+    tcbuild.refresh_probe()
+    assert is_available() == (True, "")
+    assert len(calls) == 3
+
+
+def test_is_available_persisted(
+    fake_tcbuild: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument
+    cache_file = tmp_path / "probe.json"
+    monkeypatch.setattr(tcbuild, "_probe_cache_file", None)
+    tcbuild.refresh_probe()
+    tcbuild.set_probe_cache_file(cache_file)
+    assert is_available() == (True, "")
+    # The file is replaced at once, without leaving a temporary file
+    assert [path.name for path in tmp_path.glob("probe.json*")] == ["probe.json"]
+
+    # A new process only loads the persisted result
+    monkeypatch.setattr(tcbuild, "_probe_results", {})
+    monkeypatch.setattr(tcbuild, "run", None)
+    tcbuild.set_probe_cache_file(cache_file)
+    assert is_available() == (True, "")
+
+
+def test_run_streaming(fake_tcbuild: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # pylint: disable=unused-argument
+    monkeypatch.setenv("FAKE_TCBUILD_LINES", "1000")
+    monkeypatch.setenv("FAKE_TCBUILD_FAIL", "LibA")
+    lines = []
+    log_file = fake_tcbuild.parent / "output.log"
+    (returncode, output) = tcbuild.run_streaming(
+        ["build", "LibA"],
+        on_line=lambda stream, line: lines.append((stream, line)),
+        log_file=log_file,
+        tail_lines=3,
+    )
+    assert returncode == 1
+    # Only the tail of the output is returned (the streams are read concurrently)
+    assert len(output.splitlines()) == 3
+    assert len(lines) == 1001
+    assert ("stderr", "error C0001: Failed to build LibA") in lines
+    assert len(log_file.read_text(encoding="utf-8").splitlines()) == 1001
+
+
+def test_build_streaming(fake_tcbuild: Path) -> None:
+    lines: list[tuple[str, str]] = []
+    (success, _) = build(
+        RESOURCE_PATH / "LibA" / "LibA.sln",
+        on_line=lambda stream, line: lines.append((stream, line)),
+    )
+    assert success
+    assert lines[-1][0] == "stdout"
+    assert lines[-1][1].startswith("Finished build")
+    assert fake_tcbuild.exists()
@@ -2,9 +2,9 @@
 # pylint: disable=missing-function-docstring
 
 import pytest
-from packaging.version import Version
+from packaging.version import InvalidVersion, Version
 
-from tcclitools.tclibraryreference import TcLibraryReference
+from tcclitools.tclibraryreference import TcLibraryReference, parse_version
 
 TITLE = "foo"
 COMPANY = "bar"
@@ -73,3 +73,61 @@ def test_select_invalid_latest() -> None:
     lib_b = TcLibraryReference("bar", "2", "foo")
     with pytest.raises(ValueError):
         TcLibraryReference.select_latest([lib_a, lib_b])
+
+
+def test_hash_includes_version() -> None:
+    lib_v1 = TcLibraryReference(TITLE, VERSION_STR, COMPANY)
+    lib_any = TcLibraryReference(TITLE.upper(), "*", COMPANY.upper())
+    assert lib_v1 == lib_any
+    assert hash(lib_v1) == hash(TcLibraryReference(TITLE, "1.0.0", COMPANY.upper()))
+    # An any-version reference does not replace specific versions in a set
+    references = {lib_any, lib_v1, TcLibraryReference(TITLE, "2", COMPANY)}
+    assert len(references) == 3
+
+
+def test_from_string_interned() -> None:
+    full_name = f"{TITLE}, * ({COMPANY})"
+    lib = TcLibraryReference.from_string(full_name)
+    assert TcLibraryReference.from_string(full_name) is lib
+    assert TcLibraryReference.intern(TcLibraryReference(TITLE, "*", COMPANY)) is lib
+
+
+def test_slots() -> None:
+    lib = TcLibraryReference(TITLE, VERSION_STR, COMPANY)
+    assert not hasattr(lib, "__dict__")
+    assert lib.key == (TITLE, COMPANY)
+
+
+def test_immutable() -> None:
+    lib = TcLibraryReference(TITLE, VERSION_STR, COMPANY)
+    with pytest.raises(AttributeError):
+        lib.title = "other"  # type:ignore
+    with pytest.raises(AttributeError):
+        lib.company = "other"  # type:ignore
+
+
+def test_parse_version() -> None:
+    assert parse_version("3.3.3.0") == ((3, 3, 3), "3.3.3.0")
+    assert parse_version("03.10.0.0") == ((3, 10), "3.10.0.0")
+    assert parse_version("3.3.3.0") is parse_version("3.3.3.0")
+    with pytest.raises(InvalidVersion):
+        parse_version("not a version")
+    # Versions that are not purely numeric are rejected, not truncated
+    for version in ["1.0a1", "1.0.post1", "1.0.dev1", "1.0+local"]:
+        with pytest.raises(ValueError):
+            TcLibraryReference(TITLE, version, COMPANY)
+
+
+def test_version_key() -> None:
+    lib_v1 = TcLibraryReference(TITLE, "1.0", COMPANY)
+    lib_v10 = TcLibraryReference(TITLE, "1.0.0.0", COMPANY)
+    lib_v2 = TcLibraryReference(TITLE, "1.10.0.0", COMPANY)
+    lib_v3 = TcLibraryReference(TITLE, "1.9.0.0", COMPANY)
+    assert lib_v1 == lib_v10
+    assert sorted([lib_v2, lib_v1, lib_v3], key=lambda lib: lib.version_key) == [
+        lib_v1,
+        lib_v3,
+        lib_v2,
+    ]
+    assert lib_v2.version == Version("1.10.0.0")
+    assert str(lib_v2) == f"{TITLE}, 1.10.0.0 ({COMPANY})"
@@ -47,3 +47,23 @@ def test_as_library_fail() -> None:
         / "StandardPlcProject.plcproj"
     )
     assert plcproject.as_reference() is None
+
+
+def test_source_files() -> None:
+    path = RESOURCE_PATH / "PlcDefault" / "PlcDefault" / "StandardPlcProject"
+    plcproject = TcPlcProject(path / "StandardPlcProject.plcproj")
+    assert plcproject.source_files == [
+        (path / "PlcTask.TcTTO").resolve(),
+        (path / "POUs" / "MAIN.TcPOU").resolve(),
+    ]
+
+
+def test_xmlroot() -> None:
+    plcproject = TcPlcProject(
+        RESOURCE_PATH
+        / "PlcLibrary"
+        / "PlcLibrary"
+        / "EmptyPlcProject"
+        / "EmptyPlcProject.plcproj"
+    )
+    assert plcproject.xmlroot.tag.endswith("Project")
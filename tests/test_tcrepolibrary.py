@@ -3,8 +3,10 @@
 
 from pathlib import Path
 
+import pytest
 from packaging.version import parse
 
+from tcclitools.exceptions import InvalidLibraryError
 from tcclitools.tcrepolibrary import TcRepoLibrary, get_library_repository
 
 RESOURCE_PATH = Path(".") / "tests" / "resources" / "Managed Libraries"
@@ -25,3 +27,26 @@ def test_library_from_repository() -> None:
 
 def test_all_libraries_in_repository() -> None:
     assert len(list(get_library_repository(RESOURCE_PATH))) == 2
+
+
+def test_library_name_from_start_of_file(tmp_path: Path) -> None:
+    path = tmp_path / "Tc2_Standard" / "3.3.3.0"
+    path.mkdir(parents=True)
+    # Only the start tag of the root element is read, the rest is never parsed
+    (path / "browsercache").write_text(
+        '<Library Name="Tc2_Standard, 3.3.3.0 (Beckhoff Automation GmbH)">'
+        + "<Node />" * 10000
+        + "<not valid xml",
+        encoding="utf-8",
+    )
+    lib = TcRepoLibrary(path)
+    assert lib.title == "Tc2_Standard"
+
+
+@pytest.mark.parametrize(
+    "contents", ["", "not xml", "<Library>", '<Library Name="no version">']
+)
+def test_invalid_browsercache(tmp_path: Path, contents: str) -> None:
+    (tmp_path / "browsercache").write_text(contents, encoding="utf-8")
+    with pytest.raises(InvalidLibraryError):
+        TcRepoLibrary(tmp_path)
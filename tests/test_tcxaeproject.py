@@ -1,6 +1,7 @@
 """Tests for the tcclitools TcXaeProject class"""
 # pylint: disable=missing-function-docstring
 
+import shutil
 from pathlib import Path
 
 from tcclitools.tcplcproject import TcPlcProject
@@ -27,3 +28,21 @@ def test_get_independent_plc_project() -> None:
         TcPlcProject(path / "PLC2" / "PLC2.plcproj"),
     }
     assert expected == set(solution.plc_projects)
+
+
+def test_plc_projects_parsing_stops_after_plc_section(tmp_path: Path) -> None:
+    path = RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs"
+    shutil.copytree(path, tmp_path / "MultiplePlcs")
+    tsproj = tmp_path / "MultiplePlcs" / "MultiplePlcs.tsproj"
+    # Anything after the PLC section is never parsed
+    tsproj.write_text(
+        tsproj.read_text(encoding="utf-8").replace(
+            "</Plc>", "</Plc><Io><Invalid></Io>"
+        ),
+        encoding="utf-8",
+    )
+    project = TcXaeProject(tsproj)
+    assert {plc_project.filepath.name for plc_project in project.plc_projects} == {
+        "PLC1.plcproj",
+        "PLC2.plcproj",
+    }
@@ -3,7 +3,10 @@
 # pylint: disable=missing-class-docstring
 # pylint: disable=too-few-public-methods
 
+import os
+import sys
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -47,3 +50,46 @@ def test_no_directory() -> None:
 
     with pytest.raises(Exception):
         DerivedClass(Path(__file__))
+
+
+def test_missing_path() -> None:
+    with pytest.raises(FileNotFoundError):
+        UniquePath(RESOURCE_PATH / "doesnotexist")
+
+
+def test_single_stat(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    original_stat = os.stat
+    original_lstat = os.lstat
+
+    def counting_stat(*args: Any, **kwargs: Any) -> os.stat_result:
+        calls.append(args[0])
+        return original_stat(*args, **kwargs)
+
+    def counting_lstat(*args: Any, **kwargs: Any) -> os.stat_result:
+        calls.append(args[0])
+        return original_lstat(*args, **kwargs)
+
+    path = RESOURCE_PATH / "emptyfile"
+    stat_result = os.stat(path)
+    monkeypatch.setattr(os, "stat", counting_stat)
+    monkeypatch.setattr(os, "lstat", counting_lstat)
+    UniquePath(path)
+    assert len(calls) == 1
+    UniquePath(path, stat_result=stat_result)
+    assert len(calls) == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires symlink privileges")
+def test_symlink(tmp_path: Path) -> None:
+    (tmp_path / "target").touch()
+    (tmp_path / "link").symlink_to(tmp_path / "target")
+    assert UniquePath(tmp_path / "link") == UniquePath(tmp_path / "target")
+
+
+def test_from_paths() -> None:
+    with os.scandir(RESOURCE_PATH) as entries:
+        files = [entry for entry in entries if entry.is_file()]
+    paths = UniquePath.from_paths(files + [RESOURCE_PATH / "emptyfile"])
+    assert UniquePath(RESOURCE_PATH / "emptyfile") in paths
+    assert len(paths) == len(files) + 1
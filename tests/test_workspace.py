@@ -0,0 +1,59 @@
+"""Tests for the tcclitools workspace module"""
+# pylint: disable=missing-function-docstring
+
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tcclitools.tcplcproject import TcPlcProject
+from tcclitools.tcsolution import TcSolution
+from tcclitools.workspace import load_workspace
+
+RESOURCE_PATH = Path(".") / "tests" / "resources"
+
+
+def test_load_workspace() -> None:
+    path = RESOURCE_PATH / "MultiplePlcs"
+    workspace = load_workspace(path, max_workers=4)
+    assert workspace.solutions == [TcSolution(path / "MultiplePlcs.sln")]
+    assert workspace.plc_projects == [
+        TcPlcProject(path / "MultiplePlcs" / "PLC1" / "PLC1.plcproj"),
+        TcPlcProject(path / "MultiplePlcs" / "PLC2" / "PLC2.plcproj"),
+    ]
+
+
+def test_load_workspace_library_references() -> None:
+    workspace = load_workspace(RESOURCE_PATH / "DiamondDependencies")
+    assert {reference.title for reference in workspace.library_references} >= {
+        "LibA",
+        "LibB",
+        "LibC",
+    }
+
+
+def test_library_references_keep_versions(tmp_path: Path) -> None:
+    # LibB depends on a specific version of LibA, the other project on any version
+    for name in ["LibB", "ProjectDependingOnLibA"]:
+        shutil.copytree(RESOURCE_PATH / name, tmp_path / name)
+    plcproj = tmp_path / "LibB" / "LibB" / "Untitled1" / "Untitled1.plcproj"
+    plcproj.write_text(
+        plcproj.read_text(encoding="utf-8").replace(
+            "LibA, * (Industrial Brains B.V.)", "LibA, 9.9.9.9 (Industrial Brains B.V.)"
+        ),
+        encoding="utf-8",
+    )
+    workspace = load_workspace(tmp_path)
+    names = [str(reference) for reference in workspace.library_references]
+    assert sorted(name for name in names if name.startswith("LibA")) == [
+        "LibA, * (Industrial Brains B.V.)",
+        "LibA, 9.9.9.9 (Industrial Brains B.V.)",
+    ]
+    assert len(names) == len(set(names))
+
+
+def test_concurrent_access() -> None:
+    solution = TcSolution(RESOURCE_PATH / "MultiplePlcs" / "MultiplePlcs.sln")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: list(solution.plc_projects), range(32)))
+    # All threads share the same (lazily created) PLC project objects
+    assert len({id(project) for result in results for project in result}) == 2